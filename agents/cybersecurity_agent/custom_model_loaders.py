@@ -3,6 +3,7 @@
 Chargeurs personnalisés pour les modèles de cybersécurité
 """
 import os
+import re
 import json
 import pickle
 import torch
@@ -16,6 +17,33 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Détection par mots-clés : une seule passe regex par texte (alternance compilée une fois),
+# sans copie en minuscules ni recherche de sous-chaîne par mot-clé
+_VULNERABILITY_KEYWORDS = re.compile(
+    r"(?P<xss><script>|alert\(|onerror=)"
+    r"|(?P<sql_select>select)|(?P<sql_from>from)|(?P<sql_union>union)"
+    r"|(?P<code_injection><\?php|system\()",
+    re.IGNORECASE
+)
+# Sensible à la casse, comme la détection d'origine
+_PATH_TRAVERSAL = re.compile(r"\.\./|\.\.%2F|\\\.\\\./")
+
+_NETWORK_KEYWORDS = re.compile(
+    r"(?P<ddos>ddos|syn flood|high volume)"
+    r"|(?P<port_scan>port scan|scanning|nmap)"
+    r"|(?P<brute_force>brute force|failed authentication|failed login)"
+    r"|(?P<malicious>malicious|exploit)",
+    re.IGNORECASE
+)
+
+# Groupes détectés -> (label, score), par ordre de priorité
+_NETWORK_LABELS = (
+    ("ddos", "DDOS", 0.88),
+    ("port_scan", "PORT_SCAN", 0.85),
+    ("brute_force", "BRUTE_FORCE", 0.82),
+    ("malicious", "DDOS", 0.75),  # Ou autre catégorie selon ton modèle
+)
+
 class VulnerabilityClassifierCustom:
     """Wrapper pour le modèle PyTorch de classification de vulnérabilités"""
     
@@ -73,18 +101,18 @@ class VulnerabilityClassifierCustom:
                     pass
             
             # Simulation basée sur des mots-clés (à remplacer par ton code réel)
-            text_lower = text.lower()
+            found = {match.lastgroup for match in _VULNERABILITY_KEYWORDS.finditer(text)}
             
-            if "<script>" in text_lower or "alert(" in text_lower or "onerror=" in text_lower:
+            if "xss" in found:
                 label = "XSS"
                 score = 0.85
-            elif ("select" in text_lower and "from" in text_lower) or "union" in text_lower:
+            elif ("sql_select" in found and "sql_from" in found) or "sql_union" in found:
                 label = "SQL_INJECTION"
                 score = 0.78
-            elif "../" in text or "..%2F" in text or "\\.\\./" in text:
+            elif _PATH_TRAVERSAL.search(text):
                 label = "PATH_TRAVERSAL"
                 score = 0.82
-            elif "<?php" in text_lower or "system(" in text_lower:
+            elif "code_injection" in found:
                 label = "CODE_INJECTION"
                 score = 0.80
             else:
@@ -173,24 +201,12 @@ class NetworkAnalyzerXGBoost:
             # Dans un cas réel, tu devrais extraire des features numériques
             # comme: packet_size, duration, protocol_type, flags, etc.
             
-            text_lower = text.lower()
-            
             # Simulation basée sur des mots-clés
-            if "ddos" in text_lower or "syn flood" in text_lower or "high volume" in text_lower:
-                label = "DDOS"
-                score = 0.88
-            elif "port scan" in text_lower or "scanning" in text_lower or "nmap" in text_lower:
-                label = "PORT_SCAN"
-                score = 0.85
-            elif "brute force" in text_lower or "failed authentication" in text_lower or "failed login" in text_lower:
-                label = "BRUTE_FORCE"
-                score = 0.82
-            elif "malicious" in text_lower or "exploit" in text_lower:
-                label = "DDOS"  # Ou autre catégorie selon ton modèle
-                score = 0.75
-            else:
-                label = "NORMAL"
-                score = 0.91
+            found = {match.lastgroup for match in _NETWORK_KEYWORDS.finditer(text)}
+            label, score = next(
+                ((label, score) for group, label, score in _NETWORK_LABELS if group in found),
+                ("NORMAL", 0.91)
+            )
             
             results.append({
                 "label": label,
@@ -242,17 +258,25 @@ class HuggingFaceSecurityModelsCustom:
     
     def analyze_network_traffic(self, text: str) -> Dict[str, Any]:
         """Analyse du trafic réseau"""
+        return self.analyze_network_traffic_batch([text])[0]
+    
+    def analyze_network_traffic_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyse du trafic réseau pour plusieurs textes en un seul appel au modèle"""
         try:
-            results = self.network_analyzer.predict([text])
-            result = results[0] if results else {"label": "ERROR", "score": 0}
+            results = self.network_analyzer.predict(texts)
+            if len(results) != len(texts):
+                results = [{"label": "ERROR", "score": 0}] * len(texts)
             
-            return {
-                "traffic_type": result["label"],
-                "confidence": result["score"]
-            }
+            return [
+                {
+                    "traffic_type": result["label"],
+                    "confidence": result["score"]
+                }
+                for result in results
+            ]
         except Exception as e:
             logger.error(f"Erreur analyse réseau: {e}")
-            return {"traffic_type": "error", "confidence": 0}
+            return [{"traffic_type": "error", "confidence": 0} for _ in texts]
     
     def classify_intent(self, text: str) -> Dict[str, Any]:
         """Classification d'intention"""
@@ -290,7 +314,7 @@ class HuggingFaceSecurityModelsCustom:
         if model_key == "vulnerability_classifier":
             return [self.classify_vulnerability(text) for text in texts]
         elif model_key == "network_analyzer":
-            return [self.analyze_network_traffic(text) for text in texts]
+            return self.analyze_network_traffic_batch(texts)
         elif model_key == "intent_classifier":
             return [self.classify_intent(text) for text in texts]
         else:
@@ -11,6 +11,7 @@ from urllib.parse import urlparse
 import re
 from bs4 import BeautifulSoup
 from utils.logger import get_logger
+from utils.preprocessing import extract_urls
 
 logger = get_logger("cybersecurity_agent_pentest")
 
@@ -32,6 +33,7 @@ class EnhancedCybersecurityAgent:
         self.scanning = False
         self.scan_thread = None
         self.vulnerability_patterns = self._load_vulnerability_patterns()
+        self._compiled_patterns = self._compile_vulnerability_patterns()
         
         # Démarrer le thread de scan périodique
         self._start_periodic_scan()
@@ -77,6 +79,13 @@ class EnhancedCybersecurityAgent:
             ]
         }
     
+    def _compile_vulnerability_patterns(self):
+        """Compiler une seule fois les patterns"""
+        return {
+            vuln_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for vuln_type, patterns in self.vulnerability_patterns.items()
+        }
+    
     def _start_periodic_scan(self):
         """Démarrer le scan périodique"""
         def run_periodic_scan():
@@ -228,19 +237,27 @@ class EnhancedCybersecurityAgent:
     def _analyze_content(self, content: str, scan_id: str, location: str = None):
         """Analyser le contenu HTML"""
         # Vérifier les patterns de vulnérabilités
-        for vuln_type, patterns in self.vulnerability_patterns.items():
+        for vuln_type, patterns in self._compiled_patterns.items():
             for pattern in patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
+                match = pattern.search(content)
                 
-                if matches:
+                if match:
                     severity = "high" if vuln_type in ["xss", "sql_injection"] else "medium"
                     
+                    # Même preuve que re.findall : groupe capturant s'il y en a un
+                    if pattern.groups == 0:
+                        evidence = match.group(0)
+                    elif pattern.groups == 1:
+                        evidence = match.group(1)
+                    else:
+                        evidence = match.groups()
+                    
                     self.scan_results[scan_id]["vulnerabilities"].append({
                         "type": vuln_type,
                         "severity": severity,
                         "description": f"Potentielle vulnérabilité {vuln_type} détectée",
                         "location": location or "Page principale",
-                        "evidence": matches[0] if matches else ""
+                        "evidence": evidence
                     })
     
     def _analyze_forms(self, content: str, base_url: str, scan_id: str):
@@ -336,7 +353,7 @@ class EnhancedCybersecurityAgent:
         """Traiter un message utilisateur"""
         try:
             # Extraire les URLs du message
-            urls = re.findall(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+', message)
+            urls = extract_urls(message)
             
             if urls:
                 # Scanner la première URL
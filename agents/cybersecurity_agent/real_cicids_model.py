@@ -131,21 +131,19 @@ class RealNetworkAnalyzerCICIDS:
             return self._simulate_predictions(len(features_df))
         
         try:
-            results = []
+            # Une seule matrice (N, F) contiguë : scaling, sélection et prédiction en un appel chacun
+            X = self._prepare_feature_matrix(features_df)
+            predictions = self._predict_batch(X)
             
-            for index, row in features_df.iterrows():
-                # Convertir la ligne en array numpy
-                feature_vector = self._prepare_features(row)
-                
-                # Prédiction avec le vrai modèle
-                prediction = self._predict_raw(feature_vector.reshape(1, -1))
-                
-                results.append({
+            results = [
+                {
                     "label": prediction["label"],
                     "confidence": prediction["confidence"],
                     "probabilities": prediction.get("probabilities", {}),
                     "method": "real_xgboost"
-                })
+                }
+                for prediction in predictions
+            ]
             
             logger.info(f"✅ {len(results)} prédictions avec le vrai modèle")
             return results
@@ -175,6 +173,76 @@ class RealNetworkAnalyzerCICIDS:
         
         return feature_vector
     
+    def _prepare_feature_matrix(self, features_df: pd.DataFrame) -> np.ndarray:
+        """Prépare toutes les lignes d'un DataFrame en une matrice (N, F) pour le modèle"""
+        # Colonnes réordonnées selon le modèle, features absentes à 0.0
+        X = features_df.reindex(columns=self.feature_names, fill_value=0.0).to_numpy(dtype=np.float64)
+        
+        # Appliquer le scaling si disponible
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        
+        # Appliquer la sélection de features si disponible
+        if self.feature_selector is not None:
+            X = self.feature_selector.transform(X)
+        
+        # XGBoost travaille en float32 : conversion unique en mémoire contiguë
+        return np.ascontiguousarray(X, dtype=np.float32)
+    
+    def _predict_batch(self, X: np.ndarray) -> List[Dict[str, Any]]:
+        """Prédiction vectorisée sur une matrice (N, F) avec le modèle XGBoost"""
+        # Prédiction de classe
+        if hasattr(self.model, 'predict'):
+            predictions = np.asarray(self.model.predict(X))
+        else:
+            # Si c'est un Booster XGBoost
+            predictions = np.asarray(self.model.predict(xgb.DMatrix(X)))
+        
+        # Prédiction de probabilité
+        probabilities = None
+        if hasattr(self.model, 'predict_proba'):
+            probabilities = np.asarray(self.model.predict_proba(X))
+        elif hasattr(self.model, 'predict'):
+            # Pour XGBoost Booster, les prédictions sont déjà des probabilités
+            if predictions.ndim > 1:
+                probabilities = predictions
+            else:
+                # Classification binaire ou régression
+                probabilities = np.column_stack([1.0 - predictions, predictions])
+        
+        # Convertir en labels si nécessaire
+        if self.label_encoder is not None:
+            classes = np.asarray(self.label_encoder.classes_)
+            if predictions.ndim == 1 and np.issubdtype(predictions.dtype, np.integer):
+                labels = classes[predictions]
+            elif probabilities is not None:
+                # Pour les probabilités, prendre la classe avec la plus haute proba
+                labels = classes[np.argmax(probabilities, axis=1)]
+            else:
+                labels = np.full(len(X), classes[0])
+        else:
+            labels = [str(prediction) for prediction in predictions]
+        
+        # Confiance (probabilité max)
+        if probabilities is not None:
+            confidences = probabilities.max(axis=1)
+        else:
+            confidences = np.full(len(X), 0.5)
+        
+        class_names = list(self.label_encoder.classes_) if self.label_encoder is not None else []
+        results = []
+        for i in range(len(X)):
+            prob_dict = {}
+            if probabilities is not None and class_names:
+                prob_dict = {name: float(p) for name, p in zip(class_names, probabilities[i])}
+            results.append({
+                "label": labels[i],
+                "confidence": float(confidences[i]),
+                "probabilities": prob_dict,
+                "raw_prediction": predictions[i]
+            })
+        return results
+    
     def _predict_raw(self, X: np.ndarray) -> Dict[str, Any]:
         """Prédiction brute avec le modèle XGBoost"""
         try:
@@ -145,13 +145,18 @@ class CICIDSFeatureExtractor:
         """Calcule les features liées aux tailles de paquets"""
         features = {}
         
+        # Conversion unique en tableaux numpy, puis réductions vectorisées
+        fwd = np.asarray(fwd_lengths, dtype=np.float64)
+        bwd = np.asarray(bwd_lengths, dtype=np.float64)
+        lengths = np.asarray(all_lengths, dtype=np.float64)
+        
         # Forward packet lengths
-        if fwd_lengths:
-            features['Fwd Packet Length Max'] = max(fwd_lengths)
-            features['Fwd Packet Length Min'] = min(fwd_lengths)
-            features['Fwd Packet Length Mean'] = np.mean(fwd_lengths)
-            features['Fwd Packet Length Std'] = np.std(fwd_lengths)
-            features['Total Length of Fwd Packets'] = sum(fwd_lengths)
+        if fwd.size:
+            features['Fwd Packet Length Max'] = float(fwd.max())
+            features['Fwd Packet Length Min'] = float(fwd.min())
+            features['Fwd Packet Length Mean'] = float(fwd.mean())
+            features['Fwd Packet Length Std'] = float(fwd.std())
+            features['Total Length of Fwd Packets'] = float(fwd.sum())
         else:
             features.update({
                 'Fwd Packet Length Max': 0, 'Fwd Packet Length Min': 0,
@@ -160,12 +165,12 @@ class CICIDSFeatureExtractor:
             })
         
         # Backward packet lengths
-        if bwd_lengths:
-            features['Bwd Packet Length Max'] = max(bwd_lengths)
-            features['Bwd Packet Length Min'] = min(bwd_lengths)
-            features['Bwd Packet Length Mean'] = np.mean(bwd_lengths)
-            features['Bwd Packet Length Std'] = np.std(bwd_lengths)
-            features['Total Length of Bwd Packets'] = sum(bwd_lengths)
+        if bwd.size:
+            features['Bwd Packet Length Max'] = float(bwd.max())
+            features['Bwd Packet Length Min'] = float(bwd.min())
+            features['Bwd Packet Length Mean'] = float(bwd.mean())
+            features['Bwd Packet Length Std'] = float(bwd.std())
+            features['Total Length of Bwd Packets'] = float(bwd.sum())
         else:
             features.update({
                 'Bwd Packet Length Max': 0, 'Bwd Packet Length Min': 0,
@@ -174,13 +179,15 @@ class CICIDSFeatureExtractor:
             })
         
         # Overall packet lengths
-        if all_lengths:
-            features['Min Packet Length'] = min(all_lengths)
-            features['Max Packet Length'] = max(all_lengths)
-            features['Packet Length Mean'] = np.mean(all_lengths)
-            features['Packet Length Std'] = np.std(all_lengths)
-            features['Packet Length Variance'] = np.var(all_lengths)
-            features['Average Packet Size'] = np.mean(all_lengths)
+        if lengths.size:
+            mean = float(lengths.mean())
+            var = float(lengths.var())
+            features['Min Packet Length'] = float(lengths.min())
+            features['Max Packet Length'] = float(lengths.max())
+            features['Packet Length Mean'] = mean
+            features['Packet Length Std'] = float(np.sqrt(var))
+            features['Packet Length Variance'] = var
+            features['Average Packet Size'] = mean
         else:
             features.update({
                 'Min Packet Length': 0, 'Max Packet Length': 0,
@@ -190,47 +197,49 @@ class CICIDSFeatureExtractor:
         
         return features
     
+    @staticmethod
+    def _inter_arrival_times(packets: List[Dict]) -> np.ndarray:
+        """Intervalles entre paquets consécutifs (secondes), calculés par np.diff"""
+        timestamps = np.fromiter((p.get('timestamp', 0) for p in packets), dtype=np.float64, count=len(packets))
+        timestamps.sort()
+        return np.diff(timestamps)
+    
     def _calculate_timing_features(self, packets: List[Dict], fwd_packets: List[Dict], bwd_packets: List[Dict]) -> Dict[str, float]:
         """Calcule les features temporelles"""
         features = {}
         
         # Flow-level timing
         if len(packets) > 1:
-            timestamps = [p.get('timestamp', 0) for p in packets]
-            timestamps.sort()
-            
-            # Inter-arrival times
-            iats = [timestamps[i+1] - timestamps[i] for i in range(len(timestamps)-1)]
+            # Inter-arrival times (microsecondes)
+            iats = self._inter_arrival_times(packets) * 1_000_000
             
-            if iats:
-                features['Flow IAT Mean'] = np.mean(iats) * 1_000_000  # microsecondes
-                features['Flow IAT Std'] = np.std(iats) * 1_000_000
-                features['Flow IAT Max'] = max(iats) * 1_000_000
-                features['Flow IAT Min'] = min(iats) * 1_000_000
+            if iats.size:
+                features['Flow IAT Mean'] = float(iats.mean())
+                features['Flow IAT Std'] = float(iats.std())
+                features['Flow IAT Max'] = float(iats.max())
+                features['Flow IAT Min'] = float(iats.min())
         
         # Forward timing
         if len(fwd_packets) > 1:
-            fwd_times = sorted([p.get('timestamp', 0) for p in fwd_packets])
-            fwd_iats = [fwd_times[i+1] - fwd_times[i] for i in range(len(fwd_times)-1)]
+            fwd_iats = self._inter_arrival_times(fwd_packets) * 1_000_000
             
-            if fwd_iats:
-                features['Fwd IAT Total'] = sum(fwd_iats) * 1_000_000
-                features['Fwd IAT Mean'] = np.mean(fwd_iats) * 1_000_000
-                features['Fwd IAT Std'] = np.std(fwd_iats) * 1_000_000
-                features['Fwd IAT Max'] = max(fwd_iats) * 1_000_000
-                features['Fwd IAT Min'] = min(fwd_iats) * 1_000_000
+            if fwd_iats.size:
+                features['Fwd IAT Total'] = float(fwd_iats.sum())
+                features['Fwd IAT Mean'] = float(fwd_iats.mean())
+                features['Fwd IAT Std'] = float(fwd_iats.std())
+                features['Fwd IAT Max'] = float(fwd_iats.max())
+                features['Fwd IAT Min'] = float(fwd_iats.min())
         
         # Backward timing
         if len(bwd_packets) > 1:
-            bwd_times = sorted([p.get('timestamp', 0) for p in bwd_packets])
-            bwd_iats = [bwd_times[i+1] - bwd_times[i] for i in range(len(bwd_times)-1)]
+            bwd_iats = self._inter_arrival_times(bwd_packets) * 1_000_000
             
-            if bwd_iats:
-                features['Bwd IAT Total'] = sum(bwd_iats) * 1_000_000
-                features['Bwd IAT Mean'] = np.mean(bwd_iats) * 1_000_000
-                features['Bwd IAT Std'] = np.std(bwd_iats) * 1_000_000
-                features['Bwd IAT Max'] = max(bwd_iats) * 1_000_000
-                features['Bwd IAT Min'] = min(bwd_iats) * 1_000_000
+            if bwd_iats.size:
+                features['Bwd IAT Total'] = float(bwd_iats.sum())
+                features['Bwd IAT Mean'] = float(bwd_iats.mean())
+                features['Bwd IAT Std'] = float(bwd_iats.std())
+                features['Bwd IAT Max'] = float(bwd_iats.max())
+                features['Bwd IAT Min'] = float(bwd_iats.min())
         
         # Flow rates
         duration = features.get('Flow Duration', 0) / 1_000_000  # en secondes
@@ -332,26 +341,26 @@ class CICIDSFeatureExtractor:
         
         # Features d'activité (simplification basée sur les timestamps)
         if len(packets) > 1:
-            timestamps = sorted([p.get('timestamp', 0) for p in packets])
-            gaps = [timestamps[i+1] - timestamps[i] for i in range(len(timestamps)-1)]
-            
-            # Considérer les gaps > 1 seconde comme périodes d'inactivité
-            idle_periods = [gap for gap in gaps if gap > 1.0]
-            active_periods = [gap for gap in gaps if gap <= 1.0]
-            
-            if active_periods:
-                features['Active Mean'] = np.mean(active_periods) * 1_000_000
-                features['Active Std'] = np.std(active_periods) * 1_000_000
-                features['Active Max'] = max(active_periods) * 1_000_000
-                features['Active Min'] = min(active_periods) * 1_000_000
+            gaps = self._inter_arrival_times(packets)
+            
+            # Considérer les gaps > 1 seconde comme périodes d'inactivité (masques booléens)
+            idle_mask = gaps > 1.0
+            idle_periods = gaps[idle_mask] * 1_000_000
+            active_periods = gaps[~idle_mask] * 1_000_000
+            
+            if active_periods.size:
+                features['Active Mean'] = float(active_periods.mean())
+                features['Active Std'] = float(active_periods.std())
+                features['Active Max'] = float(active_periods.max())
+                features['Active Min'] = float(active_periods.min())
             else:
                 features.update({'Active Mean': 0, 'Active Std': 0, 'Active Max': 0, 'Active Min': 0})
             
-            if idle_periods:
-                features['Idle Mean'] = np.mean(idle_periods) * 1_000_000
-                features['Idle Std'] = np.std(idle_periods) * 1_000_000
-                features['Idle Max'] = max(idle_periods) * 1_000_000
-                features['Idle Min'] = min(idle_periods) * 1_000_000
+            if idle_periods.size:
+                features['Idle Mean'] = float(idle_periods.mean())
+                features['Idle Std'] = float(idle_periods.std())
+                features['Idle Max'] = float(idle_periods.max())
+                features['Idle Min'] = float(idle_periods.min())
             else:
                 features.update({'Idle Mean': 0, 'Idle Std': 0, 'Idle Max': 0, 'Idle Min': 0})
         else:
@@ -700,6 +709,31 @@ class RealTimeTrafficCollector:
         return simulated_flows
 
 
+_network_analyzer = None
+_network_analyzer_lock = threading.Lock()
+
+
+def _shared_network_analyzer():
+    """Modèle réseau chargé une seule fois et partagé par tous les validateurs
+    
+    NetworkAnalyzerXGBoost ne lève pas d'exception en cas d'échec (modèle à None) :
+    seul un chargement réussi est conservé, un échec sera retenté au validateur suivant.
+    """
+    global _network_analyzer
+    with _network_analyzer_lock:
+        if _network_analyzer is not None:
+            return _network_analyzer
+        
+        # Import du modèle depuis votre structure
+        from agents.cybersecurity_agent.custom_model_loaders import NetworkAnalyzerXGBoost
+        analyzer = NetworkAnalyzerXGBoost()
+        if analyzer.model is not None:
+            _network_analyzer = analyzer
+        else:
+            logger.warning("⚠️ Modèle réseau non chargé, nouvel essai au prochain validateur")
+        return analyzer
+
+
 class NetworkModelValidator:
     """Validateur pour le modèle d'analyse réseau CICIDS2017"""
     
@@ -720,9 +754,8 @@ class NetworkModelValidator:
     def _load_model(self, model_path: Optional[str]):
         """Charge le modèle d'analyse réseau"""
         try:
-            # Import du modèle depuis votre structure
-            from agents.cybersecurity_agent.custom_model_loaders import NetworkAnalyzerXGBoost
-            return NetworkAnalyzerXGBoost()
+            # Téléchargement et désérialisation payés au premier validateur seulement
+            return _shared_network_analyzer()
         except Exception as e:
             logger.error(f"❌ Erreur chargement modèle: {e}")
             return None
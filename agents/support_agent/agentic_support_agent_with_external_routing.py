@@ -19,6 +19,40 @@ import re
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Expressions régulières compilées une seule fois à l'import
+_CONVERSATIONAL_PATTERNS = [re.compile(pattern) for pattern in [
+    # Présentations personnelles
+    r"je m['\']?appelle?\s+\w+",
+    r"mon nom est\s+\w+",
+    r"je suis\s+\w+",
+    r"moi c['\']?est\s+\w+",
+
+    # Phrases conversationnelles simples
+    r"^(ça va|comment ça va|bien et toi|très bien|ça roule|nickel)$",
+    r"^(merci|thanks|thx|ok|d['\']?accord|parfait|super|cool|génial)$",
+    r"^(au revoir|bye|à bientôt|ciao|salut)$",
+
+    # Questions de politesse
+    r"^(comment allez-vous|comment tu vas|ça va bien)$",
+    r"^(vous allez bien|tu vas bien)$",
+
+    # Expressions courtes sans contenu informatif
+    r"^(ah|oh|euh|hmm|hein|quoi|pardon)$",
+    r"^(lol|mdr|haha|hihi)$",
+
+    # Réponses courtes
+    r"^(oui|non|peut-être|je sais pas|aucune idée)$"
+]]
+
+_SOCIAL_PATTERNS = [re.compile(pattern) for pattern in [
+    r"je m['\']?appelle?\s+\w+",
+    r"mon nom est\s+\w+",
+    r"je suis\s+\w+",
+    r"^(ça va|comment ça va|bien et toi|très bien|ça roule|merci|thanks)$"
+]]
+
+_INTRODUCTION_RE = re.compile(r"je m['\']?appelle?\s+(\w+)")
+
 class AgenticSupportAgentWithExternalRouting:
     """Agent de support TeamSquare optimisé avec recherche web intégrée"""
     
@@ -120,8 +154,8 @@ class AgenticSupportAgentWithExternalRouting:
     def _init_llm_manager(self):
         """Initialiser le LLM"""
         try:
-            from utils.hybrid_llm_manager_gemini import HybridLLMManagerGemini
-            self.llm_manager = HybridLLMManagerGemini()
+            from utils.hybrid_llm_manager_gemini import get_hybrid_llm_gemini
+            self.llm_manager = get_hybrid_llm_gemini()
             logger.info("✅ LLM initialisé")
         except Exception as e:
             logger.error(f"❌ Erreur LLM: {e}")
@@ -247,35 +281,10 @@ class AgenticSupportAgentWithExternalRouting:
         if self._is_teamsquare_question(query):
             return False
         
-        # Pas de recherche externe pour les interactions sociales/conversationnelles
-        social_patterns = [
-            # Présentations personnelles
-            r"je m['\']?appelle?\s+\w+",
-            r"mon nom est\s+\w+",
-            r"je suis\s+\w+",
-            r"moi c['\']?est\s+\w+",
-            
-            # Phrases conversationnelles simples
-            r"^(ça va|comment ça va|bien et toi|très bien|ça roule|nickel)$",
-            r"^(merci|thanks|thx|ok|d['\']?accord|parfait|super|cool|génial)$",
-            r"^(au revoir|bye|à bientôt|ciao|salut)$",
-            
-            # Questions de politesse
-            r"^(comment allez-vous|comment tu vas|ça va bien)$",
-            r"^(vous allez bien|tu vas bien)$",
-            
-            # Expressions courtes sans contenu informatif
-            r"^(ah|oh|euh|hmm|hein|quoi|pardon)$",
-            r"^(lol|mdr|haha|hihi)$",
-            
-            # Réponses courtes
-            r"^(oui|non|peut-être|je sais pas|aucune idée)$"
-        ]
         
-        # Vérifier les patterns sociaux
-        for pattern in social_patterns:
-            if re.search(pattern, query_lower):
-                return False
+        # Pas de recherche externe pour les interactions sociales/conversationnelles
+        if any(pattern.search(query_lower) for pattern in _CONVERSATIONAL_PATTERNS):
+            return False
         
         # Pas de recherche pour les phrases très courtes (moins de 4 mots) sans mots-clés externes
         words = query_lower.split()
@@ -715,20 +724,19 @@ Réponse:"""
         query_lower = query.lower().strip()
         
         # Présentations personnelles
-        if re.search(r"je m['\']?appelle?\s+(\w+)", query_lower):
-            name_match = re.search(r"je m['\']?appelle?\s+(\w+)", query_lower)
-            if name_match:
-                name = name_match.group(1).capitalize()
-                session = self._get_or_create_session_memory(session_id)
-                session["user_info"]["name"] = name
-                
-                responses = [
-                    f"Salut {name} ! 😊 Ravi de faire ta connaissance ! Moi c'est l'assistant TeamSquare.",
-                    f"Hello {name} ! 👋 Enchanté ! Je suis là pour t'aider avec TeamSquare.",
-                    f"Coucou {name} ! 😊 Super de te rencontrer ! Comment je peux t'aider avec TeamSquare ?",
-                    f"Hey {name} ! Sympa de se présenter ! Qu'est-ce que tu veux savoir sur TeamSquare ?"
-                ]
-                return random.choice(responses)
+        name_match = _INTRODUCTION_RE.search(query_lower)
+        if name_match:
+            name = name_match.group(1).capitalize()
+            session = self._get_or_create_session_memory(session_id)
+            session["user_info"]["name"] = name
+            
+            responses = [
+                f"Salut {name} ! 😊 Ravi de faire ta connaissance ! Moi c'est l'assistant TeamSquare.",
+                f"Hello {name} ! 👋 Enchanté ! Je suis là pour t'aider avec TeamSquare.",
+                f"Coucou {name} ! 😊 Super de te rencontrer ! Comment je peux t'aider avec TeamSquare ?",
+                f"Hey {name} ! Sympa de se présenter ! Qu'est-ce que tu veux savoir sur TeamSquare ?"
+            ]
+            return random.choice(responses)
         
         # Autres interactions sociales
         if query_lower in ['ça va', 'comment ça va', 'bien et toi', 'très bien', 'ça roule']:
@@ -778,14 +786,7 @@ Réponse:"""
             
             # Gestion des interactions sociales (NOUVEAU)
             query_lower = query.lower().strip()
-            social_patterns = [
-                r"je m['\']?appelle?\s+\w+",
-                r"mon nom est\s+\w+",
-                r"je suis\s+\w+",
-                r"^(ça va|comment ça va|bien et toi|très bien|ça roule|merci|thanks)$"
-            ]
-            
-            if any(re.search(pattern, query_lower) for pattern in social_patterns):
+            if any(pattern.search(query_lower) for pattern in _SOCIAL_PATTERNS):
                 response = self._handle_social_interaction(query, session_id)
                 self._update_session_memory(session_id, query, response)
                 return response
@@ -1,12 +1,18 @@
 """
 Configuration du système de logging pour NetGuardian.
 """
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+# Thread d'écriture des logs (démarré par setup_logging)
+_listener: Optional[QueueListener] = None
+
 def setup_logging(log_level: Optional[str] = None) -> logging.Logger:
     """
     Configure le système de logging.
@@ -27,15 +33,29 @@ def setup_logging(log_level: Optional[str] = None) -> logging.Logger:
     
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
     
-    # Configuration de base
-    logging.basicConfig(
-        level=numeric_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
+    # Les écritures console/fichier se font dans un thread dédié (QueueListener) :
+    # les threads de requête ne bloquent plus sur les I/O de logging
+    global _listener
+    if _listener is None:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        handlers = [
             logging.StreamHandler(sys.stdout),
             logging.FileHandler(log_dir / "netguardian.log")
         ]
-    )
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        
+        # Configuration de base ("%(message)s" : le formatage complet est fait par les handlers réels)
+        logging.basicConfig(
+            level=numeric_level,
+            format="%(message)s",
+            handlers=[QueueHandler(log_queue)]
+        )
     
     # Créer et configurer le logger
     logger = logging.getLogger("netguardian")
@@ -5,21 +5,194 @@ Ce module permet de collecter, stocker et analyser le feedback des utilisateurs
 pour améliorer les performances du système.
 """
 import logging
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterable
 import os
-import json
-from datetime import datetime
+import copy
+import time
+import queue
+import weakref
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
 import uuid
 
+import numpy as np
+
+from utils.json_utils import json_dumps, json_loads
+
 logger = logging.getLogger(__name__)
 
+FEEDBACK_CATEGORIES = ["general", "security", "support", "pentest"]
+
+# Journal append-only par catégorie : une ligne JSON compacte par feedback (ou mise à jour)
+FEEDBACK_LOG_NAME = "feedback.jsonl"
+
+
+def _to_float(value: Any) -> float:
+    """Convertit une note en flottant (NaN si elle n'est pas numérique)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _ratings_array(ratings: List[Any]) -> np.ndarray:
+    """
+    Convertit les notes collectées en tableau float64, sans les valeurs non numériques.
+    
+    La conversion et le filtrage (masque np.isfinite) se font en C ; la conversion
+    élément par élément n'intervient que si une note n'est pas convertible.
+    """
+    try:
+        values = np.asarray(ratings, dtype=np.float64)
+    except (TypeError, ValueError):
+        values = np.fromiter((_to_float(r) for r in ratings), dtype=np.float64, count=len(ratings))
+    return values[np.isfinite(values)]
+
+class _FeedbackLogWriter:
+    """
+    Écrit les journaux de feedback depuis un thread dédié.
+    
+    Séparé de FeedbackManager : le thread ne référence que cet objet, le
+    gestionnaire peut donc être libéré (weakref.finalize ferme alors l'écrivain).
+    """
+    
+    def __init__(self, storage_path: str, batch_size: int = 256, max_pending: int = 10_000):
+        """
+        Initialise l'écrivain et démarre son thread.
+        
+        Args:
+            storage_path: Dossier racine des journaux par catégorie
+            batch_size: Nombre maximal d'enregistrements regroupés par écriture
+            max_pending: Taille maximale de la file d'écriture
+        """
+        self.storage_path = storage_path
+        self.batch_size = batch_size
+        
+        # Journaux ouverts une seule fois par catégorie (au lieu d'un fichier par feedback)
+        self._handles = {}
+        self._handles_lock = threading.Lock()
+        
+        self._queue = queue.Queue(maxsize=max_pending)
+        # Décide sous un même verrou entre mise en file et écriture directe (après close)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer_loop, name="feedback-writer", daemon=True)
+        self._thread.start()
+    
+    def log_path(self, category: str) -> str:
+        """Chemin du journal JSONL d'une catégorie."""
+        return os.path.join(self.storage_path, category, FEEDBACK_LOG_NAME)
+    
+    def append(self, category: str, line: bytes) -> None:
+        """
+        Ajoute une ligne au journal d'une catégorie, via le thread tant qu'il est ouvert.
+        
+        Args:
+            category: Catégorie du feedback
+            line: Ligne JSON terminée par un saut de ligne
+        """
+        with self._lock:
+            if not self._closed:
+                self._queue.put((category, line))
+                return
+        
+        # Écrivain fermé : écriture directe, après les enregistrements déjà en file
+        self._thread.join()
+        self._write_lines({category: [line]})
+    
+    def _writer_loop(self) -> None:
+        """
+        Vide la file d'écriture par lots (jusqu'à batch_size enregistrements).
+        
+        La file contient des lignes (catégorie, ligne), des marqueurs de flush
+        (threading.Event, signalés une fois les lignes précédentes écrites) et
+        None, dernier élément mis en file par close.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            lines_by_category = {}
+            markers = []
+            for item in batch:
+                if isinstance(item, tuple):
+                    category, line = item
+                    lines_by_category.setdefault(category, []).append(line)
+                elif item is not None:
+                    markers.append(item)
+            
+            try:
+                self._write_lines(lines_by_category)
+            except Exception as e:
+                logger.error(f"Erreur d'écriture du feedback: {e}")
+            finally:
+                for marker in markers:
+                    marker.set()
+            
+            if None in batch:
+                return
+    
+    def _write_lines(self, lines_by_category: Dict[str, List[bytes]]) -> None:
+        """
+        Ajoute des lignes aux journaux, en une écriture par catégorie.
+        
+        Args:
+            lines_by_category: Lignes JSON à ajouter, par catégorie
+        """
+        with self._handles_lock:
+            for category, lines in lines_by_category.items():
+                handle = self._handles.get(category)
+                if handle is None:
+                    os.makedirs(os.path.join(self.storage_path, category), exist_ok=True)
+                    handle = open(self.log_path(category), "ab", buffering=1 << 16)
+                    self._handles[category] = handle
+                handle.write(b"".join(lines))
+                handle.flush()
+    
+    def flush(self) -> None:
+        """
+        Attend que les feedbacks mis en file avant l'appel soient écrits sur disque.
+        
+        Un marqueur est ajouté à la file : les feedbacks collectés ensuite
+        ne retardent pas l'appelant.
+        """
+        with self._lock:
+            marker = None if self._closed else threading.Event()
+            if marker is not None:
+                self._queue.put(marker)
+        
+        if marker is not None:
+            marker.wait()
+        else:
+            self._thread.join()
+    
+    def close(self) -> None:
+        """Écrit les feedbacks en attente puis ferme les journaux ouverts."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+        
+        with self._handles_lock:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+
 class FeedbackManager:
     """Gestionnaire de feedback utilisateur."""
     
     def __init__(self, 
                  storage_path: str = "data/feedback",
                  analysis_frequency: str = "daily",
-                 notification_enabled: bool = True):
+                 notification_enabled: bool = True,
+                 cache_ttl_seconds: float = 30.0):
         """
         Initialise le gestionnaire de feedback.
         
@@ -27,17 +200,35 @@ class FeedbackManager:
             storage_path: Chemin pour stocker les données de feedback
             analysis_frequency: Fréquence d'analyse du feedback ('daily', 'weekly', 'monthly')
             notification_enabled: Activer les notifications d'analyse
+            cache_ttl_seconds: Durée de validité des analyses en cache (0 pour désactiver)
         """
         self.storage_path = storage_path
         self.analysis_frequency = analysis_frequency
         self.notification_enabled = notification_enabled
+        self.cache_ttl_seconds = cache_ttl_seconds
         
         # Créer le dossier de stockage s'il n'existe pas
         os.makedirs(storage_path, exist_ok=True)
         
         # Créer les sous-dossiers par catégorie
-        for category in ["general", "security", "support", "pentest"]:
+        for category in FEEDBACK_CATEGORIES:
             os.makedirs(os.path.join(storage_path, category), exist_ok=True)
+        
+        # Écritures confiées à un thread : l'appelant n'attend pas le disque, et les
+        # enregistrements en attente sont regroupés en une écriture par catégorie.
+        # L'écrivain est fermé à la libération du gestionnaire ou à la sortie de l'interpréteur
+        self._log_writer = _FeedbackLogWriter(storage_path)
+        self._finalizer = weakref.finalize(self, self._log_writer.close)
+        
+        # Index en mémoire des journaux : seules les lignes ajoutées depuis la dernière lecture sont parsées
+        self._records = {}      # catégorie -> {identifiant: feedback}
+        self._id_index = {}     # identifiant -> catégorie
+        self._log_offsets = {}  # catégorie -> octets du journal déjà indexés
+        self._index_lock = threading.RLock()
+        
+        # Analyses récentes : (catégorie, période) -> (expiration, résultat)
+        self._analysis_cache = {}
+        self._cache_lock = threading.RLock()
     
     def collect_feedback(self, 
                         feedback_type: str,
@@ -59,7 +250,7 @@ class FeedbackManager:
             str: Identifiant du feedback
         """
         # Générer un identifiant unique pour le feedback
-        feedback_id = str(uuid.uuid4())
+        feedback_id = uuid.uuid4().hex
         
         # Préparer les données de feedback
         feedback_data = {
@@ -74,13 +265,8 @@ class FeedbackManager:
             "processed": False
         }
         
-        # Déterminer le chemin de stockage
-        category_path = os.path.join(self.storage_path, category)
-        filepath = os.path.join(category_path, f"{feedback_id}.json")
-        
-        # Sauvegarder le feedback
-        with open(filepath, 'w') as f:
-            json.dump(feedback_data, f, indent=2)
+        # Sauvegarder le feedback dans le journal de sa catégorie
+        self._append_record(feedback_data)
         
         logger.info(f"Feedback collecté: {feedback_id} (type: {feedback_type}, catégorie: {category})")
         
@@ -99,14 +285,16 @@ class FeedbackManager:
         Returns:
             Dict: Données du feedback ou None si non trouvé
         """
-        # Rechercher le feedback dans toutes les catégories
-        for category in ["general", "security", "support", "pentest"]:
-            category_path = os.path.join(self.storage_path, category)
-            filepath = os.path.join(category_path, f"{feedback_id}.json")
-            
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    return json.load(f)
+        # Lire ses propres écritures : vider la file avant de lire le journal
+        self.flush()
+        
+        # Catégorie connue par l'index, sinon rafraîchir toutes les catégories
+        category = self._id_index.get(feedback_id)
+        categories = [category] if category else FEEDBACK_CATEGORIES
+        for cat in categories:
+            feedback = self._category_records(cat).get(feedback_id)
+            if feedback is not None:
+                return dict(feedback)
         
         logger.warning(f"Feedback non trouvé: {feedback_id}")
         return None
@@ -136,13 +324,8 @@ class FeedbackManager:
             feedback["notes"] = notes
         feedback["updated_at"] = datetime.now().isoformat()
         
-        # Sauvegarder les modifications
-        category = feedback["category"]
-        category_path = os.path.join(self.storage_path, category)
-        filepath = os.path.join(category_path, f"{feedback_id}.json")
-        
-        with open(filepath, 'w') as f:
-            json.dump(feedback, f, indent=2)
+        # Sauvegarder les modifications (la nouvelle version remplace l'ancienne à la lecture)
+        self._append_record(feedback)
         
         logger.info(f"Statut du feedback {feedback_id} mis à jour: {status}")
         return True
@@ -160,32 +343,39 @@ class FeedbackManager:
         Returns:
             Dict: Résultats de l'analyse
         """
+        # Réutiliser une analyse récente tant qu'aucun feedback n'a été ajouté
+        cache_key = (category, time_period)
+        with self._cache_lock:
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                logger.debug(f"Analyse de feedback servie depuis le cache: {cache_key}")
+                # Copie profonde : les statistiques imbriquées ne sont pas partagées avec le cache
+                return copy.deepcopy(cached[1])
+        
         # Déterminer les catégories à analyser
-        categories = ["general", "security", "support", "pentest"]
+        categories = FEEDBACK_CATEGORIES
         if category:
             categories = [category]
         
-        # Collecter tous les feedbacks des catégories sélectionnées
-        all_feedback = []
-        for cat in categories:
-            category_path = os.path.join(self.storage_path, cat)
-            for filename in os.listdir(category_path):
-                if filename.endswith(".json"):
-                    filepath = os.path.join(category_path, filename)
-                    with open(filepath, 'r') as f:
-                        feedback = json.load(f)
-                        all_feedback.append(feedback)
-        
         # Filtrer par période si spécifiée
+        cutoff = None
         if time_period:
-            cutoff = self._get_cutoff_date(time_period)
-            all_feedback = [
-                f for f in all_feedback 
-                if datetime.fromisoformat(f["timestamp"]) >= cutoff
-            ]
-        
-        # Analyser les données
-        analysis = self._perform_analysis(all_feedback)
+            # Horodatages ISO 8601 de même format : la comparaison de chaînes suit l'ordre chronologique
+            cutoff = self._get_cutoff_date(time_period).isoformat()
+        
+        # Lire ses propres écritures, avant de verrouiller l'index
+        self.flush()
+        
+        # Analyser les feedbacks des catégories sélectionnées en un seul passage, sans liste
+        # intermédiaire ; l'index est verrouillé pendant le parcours
+        with self._index_lock:
+            selected = (
+                f
+                for cat in categories
+                for f in self._category_records(cat).values()
+                if cutoff is None or f["timestamp"] >= cutoff
+            )
+            analysis = self._perform_analysis(selected)
         
         # Enregistrer l'analyse
         analysis_path = os.path.join(self.storage_path, "analysis")
@@ -194,17 +384,139 @@ class FeedbackManager:
         analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         filepath = os.path.join(analysis_path, f"{analysis_id}.json")
         
-        with open(filepath, 'w') as f:
-            json.dump(analysis, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(json_dumps(analysis, indent=True))
         
         logger.info(f"Analyse de feedback complétée: {analysis_id}")
         
+        if self.cache_ttl_seconds > 0:
+            with self._cache_lock:
+                self._analysis_cache[cache_key] = (time.monotonic() + self.cache_ttl_seconds, copy.deepcopy(analysis))
+        
         # Envoyer des notifications si activé
         if self.notification_enabled:
             self._send_analysis_notification(analysis)
         
         return analysis
     
+    def _log_path(self, category: str) -> str:
+        """Chemin du journal JSONL d'une catégorie."""
+        return self._log_writer.log_path(category)
+    
+    def _append_record(self, record: Dict[str, Any]) -> None:
+        """
+        Ajoute un enregistrement au journal de sa catégorie.
+        
+        Args:
+            record: Données du feedback
+        """
+        line = json_dumps(record) + b"\n"
+        category = record["category"]
+        
+        self._log_writer.append(category, line)
+        self._invalidate(category)
+    
+    def flush(self) -> None:
+        """Attend que les feedbacks mis en file avant l'appel soient écrits sur disque."""
+        self._log_writer.flush()
+    
+    def _invalidate(self, category: str) -> None:
+        """
+        Invalide les analyses en cache portant sur une catégorie.
+        
+        Args:
+            category: Catégorie modifiée
+        """
+        with self._cache_lock:
+            for key in [key for key in self._analysis_cache if key[0] in (None, category)]:
+                del self._analysis_cache[key]
+    
+    def _category_records(self, category: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Retourne les feedbacks d'une catégorie, indexés par identifiant.
+        
+        Les anciens fichiers individuels ({id}.json) sont lus une seule fois ;
+        ensuite, seule la fin du journal écrite depuis la dernière lecture est parsée.
+        Pour un même identifiant, la version la plus récente l'emporte.
+        
+        Args:
+            category: Catégorie à lire
+            
+        L'appelant vide la file d'écriture (flush) au préalable, hors du verrou de l'index.
+        
+        Returns:
+            Dict: Feedbacks indexés par identifiant (ne pas modifier)
+        """
+        with self._index_lock:
+            records = self._records.get(category)
+            if records is None:
+                records = self._load_legacy_files(category)
+                for feedback_id in records:
+                    self._id_index[feedback_id] = category
+                self._records[category] = records
+                self._log_offsets[category] = 0
+            
+            self._index_new_entries(category, records)
+            return records
+    
+    def _load_legacy_files(self, category: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Lit les feedbacks stockés un par fichier (format antérieur au journal).
+        
+        Args:
+            category: Catégorie à lire
+            
+        Returns:
+            Dict: Feedbacks indexés par identifiant
+        """
+        records = {}
+        category_path = os.path.join(self.storage_path, category)
+        
+        # scandir : nom et type fournis par la lecture du dossier, sans stat() ni join par fichier
+        with os.scandir(category_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False):
+                    with open(entry.path, 'rb') as f:
+                        feedback = json_loads(f.read())
+                        records[feedback["id"]] = feedback
+        
+        return records
+    
+    def _index_new_entries(self, category: str, records: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Indexe les lignes ajoutées au journal depuis la dernière lecture.
+        
+        Args:
+            category: Catégorie du journal
+            records: Index de la catégorie à compléter
+        """
+        log_path = self._log_path(category)
+        try:
+            size = os.path.getsize(log_path)
+        except OSError:
+            return
+        
+        offset = self._log_offsets[category]
+        if size <= offset:
+            return
+        
+        with open(log_path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read(size - offset)
+        
+        # Ignorer une éventuelle ligne incomplète (écriture en cours par un autre processus)
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if line.strip():
+                feedback = json_loads(line)
+                records[feedback["id"]] = feedback
+                self._id_index[feedback["id"]] = category
+        self._log_offsets[category] = offset + end
+    
+    def close(self) -> None:
+        """Écrit les feedbacks en attente puis ferme les journaux ouverts."""
+        self._finalizer()
+    
     def _check_for_analysis_trigger(self, feedback_type: str, category: str) -> None:
         """
         Vérifie si une analyse doit être déclenchée.
@@ -237,7 +549,7 @@ class FeedbackManager:
         if time_period == "week":
             # Retourner le début de la semaine (lundi)
             days_since_monday = now.weekday()
-            return datetime(now.year, now.month, now.day, 0, 0, 0) - datetime.timedelta(days=days_since_monday)
+            return datetime(now.year, now.month, now.day, 0, 0, 0) - timedelta(days=days_since_monday)
         
         if time_period == "month":
             return datetime(now.year, now.month, 1, 0, 0, 0)
@@ -245,53 +557,60 @@ class FeedbackManager:
         # Par défaut, retourner le début de la journée
         return datetime(now.year, now.month, now.day, 0, 0, 0)
     
-    def _perform_analysis(self, feedback_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _perform_analysis(self, feedback_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Effectue l'analyse du feedback.
         
         Args:
-            feedback_list: Liste des feedbacks à analyser
+            feedback_list: Feedbacks à analyser (parcourus une seule fois)
             
         Returns:
             Dict: Résultats de l'analyse
         """
         # Initialiser les compteurs
-        total = len(feedback_list)
-        by_type = {}
-        by_category = {}
-        by_status = {}
+        total = 0
+        by_type = Counter()
+        by_category = Counter()
+        by_status = Counter()
         ratings = []
         
         # Analyser chaque feedback
         for feedback in feedback_list:
-            # Compter par type
-            feedback_type = feedback.get("type", "unknown")
-            by_type[feedback_type] = by_type.get(feedback_type, 0) + 1
-            
-            # Compter par catégorie
-            category = feedback.get("category", "unknown")
-            by_category[category] = by_category.get(category, 0) + 1
+            total += 1
             
-            # Compter par statut
-            status = feedback.get("status", "unknown")
-            by_status[status] = by_status.get(status, 0) + 1
+            # Compter par type, catégorie et statut
+            feedback_type = feedback.get("type", "unknown")
+            by_type[feedback_type] += 1
+            by_category[feedback.get("category", "unknown")] += 1
+            by_status[feedback.get("status", "unknown")] += 1
             
             # Collecter les ratings
             if feedback_type == "rating" and "rating" in feedback.get("content", {}):
                 ratings.append(feedback["content"]["rating"])
         
-        # Calculer la moyenne des ratings
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0
+        # Statistiques des ratings, calculées sur un seul tableau
+        rating_stats = {}
+        avg_rating = 0
+        values = _ratings_array(ratings)
+        if values.size:
+            avg_rating = float(values.mean())
+            rating_stats = {
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "median": float(np.median(values)),
+                "std": float(values.std())
+            }
         
         # Préparer les résultats
         return {
             "timestamp": datetime.now().isoformat(),
             "total_feedback": total,
-            "by_type": by_type,
-            "by_category": by_category,
-            "by_status": by_status,
+            "by_type": dict(by_type),
+            "by_category": dict(by_category),
+            "by_status": dict(by_status),
             "average_rating": avg_rating,
-            "rating_count": len(ratings),
+            "rating_count": int(values.size),
+            "rating_stats": rating_stats,
             "period": "custom"
         }
     
@@ -302,7 +621,7 @@ class FeedbackManager:
         Args:
             analysis: Résultats de l'analyse
         """
-        logger.info(f"Envoi de notification d'analyse: {len(analysis['total_feedback'])} feedbacks analysés")
+        logger.info(f"Envoi de notification d'analyse: {analysis['total_feedback']} feedbacks analysés")
         
         # Logique pour envoyer des notifications (email, Slack, etc.)
         # Cette implémentation est un placeholder
@@ -14,6 +14,62 @@ from utils.preprocessing import clean_text
 
 logger = get_logger("graph_manager")
 
+# Termes potentiellement liés à la cybersécurité
+SECURITY_TERMS = [
+    "malware", "virus", "ransomware", "phishing", "hacker", "firewall",
+    "VPN", "encryption", "vulnerability", "exploit", "backdoor", "botnet",
+    "DDoS", "SQL injection", "XSS", "CSRF", "authentication", "authorization"
+]
+
+# Une seule alternance compilée à l'import : un passage sur le texte au lieu d'une recherche par terme
+_SECURITY_TERMS_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, SECURITY_TERMS)) + r')\b', re.IGNORECASE
+)
+_NAMED_ENTITY_RE = re.compile(r'\b[A-Z][a-zA-Z]+\b')
+
+# Automate Aho-Corasick optionnel (pyahocorasick) : un passage en O(len(texte)) quel que soit
+# le nombre de termes ; à défaut, l'alternance compilée ci-dessus est utilisée
+try:
+    import ahocorasick
+    
+    _SECURITY_AUTOMATON = ahocorasick.Automaton()
+    for _term in SECURITY_TERMS:
+        _SECURITY_AUTOMATON.add_word(_term.lower(), _term.lower())
+    _SECURITY_AUTOMATON.make_automaton()
+except ImportError:
+    _SECURITY_AUTOMATON = None
+
+
+def _is_word_char(char: str) -> bool:
+    """Caractère de mot au sens de \\w (pour reproduire les bornes \\b)"""
+    return char.isalnum() or char == "_"
+
+
+def find_security_terms(text: str) -> Set[str]:
+    """
+    Trouve les termes de sécurité présents dans un texte.
+    
+    Args:
+        text: Texte à analyser
+        
+    Returns:
+        Ensemble des termes trouvés (en minuscules)
+    """
+    if _SECURITY_AUTOMATON is None:
+        return {match.lower() for match in _SECURITY_TERMS_RE.findall(text)}
+    
+    lowered = text.lower()
+    found = set()
+    for end, term in _SECURITY_AUTOMATON.iter(lowered):
+        start = end - len(term) + 1
+        # Ne garder que les mots entiers, comme avec \b
+        if start > 0 and _is_word_char(lowered[start - 1]):
+            continue
+        if end + 1 < len(lowered) and _is_word_char(lowered[end + 1]):
+            continue
+        found.add(term)
+    return found
+
 class KnowledgeGraphManager:
     """
     Gestionnaire de graphes de connaissances pour NetGuardian.
@@ -225,23 +281,14 @@ class KnowledgeGraphManager:
         # Implémentation simple basée sur des règles
         # Dans un système réel, on utiliserait un modèle NER plus sophistiqué
         
-        entities = []
-        
         # Extraire les termes potentiellement liés à la cybersécurité
-        security_terms = [
-            "malware", "virus", "ransomware", "phishing", "hacker", "firewall",
-            "VPN", "encryption", "vulnerability", "exploit", "backdoor", "botnet",
-            "DDoS", "SQL injection", "XSS", "CSRF", "authentication", "authorization"
-        ]
-        
-        for term in security_terms:
-            if re.search(r'\b' + re.escape(term) + r'\b', text, re.IGNORECASE):
-                entities.append((term.lower(), "SecurityConcept"))
+        security_concepts = find_security_terms(text)
+        entities = [(term, "SecurityConcept") for term in security_concepts]
         
         # Extraire les mots commençant par une majuscule (potentielles entités nommées)
-        named_entities = re.findall(r'\b[A-Z][a-zA-Z]+\b', text)
+        named_entities = _NAMED_ENTITY_RE.findall(text)
         for entity in named_entities:
-            if len(entity) > 1 and entity.lower() not in [e[0] for e in entities]:
+            if len(entity) > 1 and entity.lower() not in security_concepts:
                 entities.append((entity, "NamedEntity"))
         
         return list(set(entities))  # Éliminer les doublons
@@ -2,23 +2,126 @@
 Module for LangChain callbacks in NetGuardian.
 """
 from typing import Dict, List, Any, Optional
+from collections import Counter, deque
 from langchain.callbacks.base import BaseCallbackHandler
 import wandb
+import atexit
+import threading
 import time
 
 from config.logging_config import get_logger
 
 logger = get_logger("langchain_callbacks")
 
+class _WandbSender:
+    """Background thread sending W&B payloads for every callback handler.
+    
+    A single thread and queue are shared by all handlers, which are often created
+    per chain or per request; at most ``max_pending`` payloads are buffered, the
+    oldest dropped first.
+    """
+    
+    def __init__(self, max_pending: int = 1000):
+        self._pending = deque(maxlen=max_pending)
+        self._ready = threading.Condition()
+        self._queued = 0
+        self._sent = 0
+        self._closed = False
+        self._thread = None
+    
+    def submit(self, payload: Dict[str, Any]) -> int:
+        """Queue a payload and return its sequence number (0 if it was sent synchronously)."""
+        with self._ready:
+            if not self._closed:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._send_loop, name="wandb-callback", daemon=True)
+                    self._thread.start()
+                self._queued += 1
+                self._pending.append((self._queued, payload))
+                self._ready.notify_all()
+                return self._queued
+        # Sender stopped (interpreter exit): send directly
+        self._send(payload)
+        return 0
+    
+    def wait_for(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """Wait until every payload up to ``seq`` has been sent (or dropped)."""
+        with self._ready:
+            return self._ready.wait_for(
+                lambda: self._sent >= seq or self._thread is None or not self._thread.is_alive(),
+                timeout,
+            )
+    
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Send the remaining payloads and stop the background thread."""
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+    
+    def _send_loop(self) -> None:
+        """Send queued payloads to W&B in order until the sender is closed and drained."""
+        while True:
+            with self._ready:
+                while not self._pending and not self._closed:
+                    self._ready.wait()
+                if not self._pending:
+                    return
+                seq, payload = self._pending.popleft()
+            try:
+                self._send(payload)
+            finally:
+                with self._ready:
+                    self._sent = seq
+                    self._ready.notify_all()
+    
+    @staticmethod
+    def _send(payload: Dict[str, Any]) -> None:
+        try:
+            wandb.log(payload)
+        except Exception as e:
+            logger.warning(f"W&B logging failed: {e}")
+
+
+_sender = _WandbSender()
+atexit.register(_sender.close)
+
+
 class WandbCallbackHandler(BaseCallbackHandler):
     """Callback handler for logging to Weights & Biases."""
     
     def __init__(self, run_name: str = None):
-        """Initialize the callback handler."""
+        """Initialize the callback handler.
+        
+        Metrics are sent to W&B by a background thread shared by all handlers, so
+        callbacks never wait on the network. Remaining payloads are sent at interpreter exit.
+        """
         super().__init__()
         self.run_name = run_name or "netguardian-run"
         self.steps = []
         self.current_step = {}
+        self.call_counts = Counter()
+        self._last_seq = 0
+    
+    def _complete_step(self) -> None:
+        """Store the current step and log the updated call count for its type."""
+        step_type = self.current_step["type"]
+        self.steps.append(self.current_step)
+        self.current_step = {}
+        self.call_counts[step_type] += 1
+        self._log({f"{step_type}_calls": self.call_counts[step_type]})
+    
+    def _log(self, payload: Dict[str, Any]) -> None:
+        """Queue a payload for W&B without blocking the caller."""
+        if not wandb.run:
+            return
+        self._last_seq = _sender.submit(payload) or self._last_seq
+    
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Wait until this handler's queued payloads have been sent."""
+        _sender.wait_for(self._last_seq, timeout)
         
     def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
         """Log when LLM starts."""
@@ -34,13 +137,7 @@ class WandbCallbackHandler(BaseCallbackHandler):
         if self.current_step.get("type") == "llm":
             self.current_step["response"] = response.generations
             self.current_step["end_time"] = time.time()
-            self.steps.append(self.current_step)
-            self.current_step = {}
-            
-            if wandb.run:
-                wandb.log({
-                    "llm_calls": len([s for s in self.steps if s.get("type") == "llm"])
-                })
+            self._complete_step()
                 
     def on_chain_start(self, serialized: Dict[str, Any], inputs: Dict[str, Any], **kwargs: Any) -> None:
         """Log when chain starts."""
@@ -56,13 +153,7 @@ class WandbCallbackHandler(BaseCallbackHandler):
         if self.current_step.get("type") == "chain":
             self.current_step["outputs"] = outputs
             self.current_step["end_time"] = time.time()
-            self.steps.append(self.current_step)
-            self.current_step = {}
-            
-            if wandb.run:
-                wandb.log({
-                    "chain_calls": len([s for s in self.steps if s.get("type") == "chain"])
-                })
+            self._complete_step()
                 
     def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> None:
         """Log when tool starts."""
@@ -78,20 +169,14 @@ class WandbCallbackHandler(BaseCallbackHandler):
         if self.current_step.get("type") == "tool":
             self.current_step["output"] = output
             self.current_step["end_time"] = time.time()
-            self.steps.append(self.current_step)
-            self.current_step = {}
-            
-            if wandb.run:
-                wandb.log({
-                    "tool_calls": len([s for s in self.steps if s.get("type") == "tool"])
-                })
+            self._complete_step()
                 
-    def flush(self) -> None:
-        """Flush the logs."""
-        if wandb.run:
-            wandb.log({
-                "total_steps": len(self.steps),
-                "llm_calls": len([s for s in self.steps if s.get("type") == "llm"]),
-                "chain_calls": len([s for s in self.steps if s.get("type") == "chain"]),
-                "tool_calls": len([s for s in self.steps if s.get("type") == "tool"])
-            })
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Log the totals and wait until every payload of this handler has been sent."""
+        self._log({
+            "total_steps": len(self.steps),
+            "llm_calls": self.call_counts["llm"],
+            "chain_calls": self.call_counts["chain"],
+            "tool_calls": self.call_counts["tool"]
+        })
+        _sender.wait_for(self._last_seq, timeout)
@@ -0,0 +1,58 @@
+"""
+Test du partage du modèle réseau entre validateurs :
+un chargement échoué n'est pas conservé, le suivant est retenté
+"""
+import sys
+import types
+from pathlib import Path
+
+# Ajouter le répertoire racine au path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.cybersecurity_agent import traffic_collector
+
+
+def test_failed_load_is_retried():
+    print("🧪 TEST CACHE DU MODÈLE RÉSEAU")
+    print("-" * 50)
+
+    attempts = []
+
+    class FlakyAnalyzer:
+        """Premier chargement en échec (modèle à None, comme NetworkAnalyzerXGBoost), puis succès"""
+        def __init__(self):
+            attempts.append(self)
+            self.model = None if len(attempts) == 1 else object()
+
+    fake_loaders = types.ModuleType("agents.cybersecurity_agent.custom_model_loaders")
+    fake_loaders.NetworkAnalyzerXGBoost = FlakyAnalyzer
+
+    module_name = "agents.cybersecurity_agent.custom_model_loaders"
+    previous_module = sys.modules.get(module_name)
+    previous_analyzer = traffic_collector._network_analyzer
+    sys.modules[module_name] = fake_loaders
+    traffic_collector._network_analyzer = None
+    try:
+        first = traffic_collector._shared_network_analyzer()
+        assert first.model is None
+        assert traffic_collector._network_analyzer is None, "un chargement échoué ne doit pas être conservé"
+
+        second = traffic_collector._shared_network_analyzer()
+        assert second.model is not None
+        assert second is not first
+
+        third = traffic_collector._shared_network_analyzer()
+        assert third is second, "un chargement réussi doit être partagé"
+        assert len(attempts) == 2
+        print("✅ Échec retenté, succès partagé")
+    finally:
+        traffic_collector._network_analyzer = previous_analyzer
+        if previous_module is not None:
+            sys.modules[module_name] = previous_module
+        else:
+            sys.modules.pop(module_name, None)
+
+
+if __name__ == "__main__":
+    test_failed_load_is_retried()
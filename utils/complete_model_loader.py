@@ -2,23 +2,135 @@
 Gestionnaire unifié et complet pour tous les modèles fine-tunés
 """
 import os
-import json
+import sys
+import hashlib
+import mmap
+import ctypes
 import pickle
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 import torch
 import numpy as np
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
-from transformers import AutoTokenizer, AutoModel, AutoConfig
+from transformers import AutoTokenizer, AutoModelForSequenceClassification, AutoConfig
 import joblib
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.feature_selection import SelectKBest
 
 from config.models_urls import MODELS_URLS, get_model_url
+from utils.json_utils import json_dumps, json_loads
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Préprocesseurs sklearn migrables vers safetensors : attributs tableaux / attributs simples
+PREPROCESSOR_SPECS = {
+    "StandardScaler": (StandardScaler, ("mean_", "scale_", "var_", "n_samples_seen_"),
+                       ("with_mean", "with_std", "copy", "n_features_in_", "n_samples_seen_")),
+    "SelectKBest": (SelectKBest, ("scores_", "pvalues_"), ("k", "n_features_in_")),
+    "LabelEncoder": (LabelEncoder, ("classes_",), ("classes_",)),
+}
+
+# Chargement déclaratif des modèles : composants (nom, chargeur, fichier) dans l'ordre de chargement.
+# Les fichiers à télécharger proviennent de MODELS_URLS.
+MODEL_SPECS = {
+    "network_analyzer": {
+        "display_name": "Network Analyzer",
+        "icon": "🛡️",
+        "components": [
+            ("model", "pickle", "xgboost_cicids2017_production.pkl"),
+            ("scaler", "preprocessor", "scaler.pkl"),
+            ("feature_selector", "preprocessor", "feature_selector.pkl"),
+            ("label_encoder", "preprocessor", "label_encoder.pkl"),
+            ("metadata", "json", "model_metadata.json"),
+        ]
+    },
+    "intent_classifier": {
+        "display_name": "Intent Classifier",
+        "icon": "🧠",
+        "components": [
+            ("config", "hf_config", None),
+            ("tokenizer", "hf_tokenizer", None),
+            ("labels", "json", "intent_labels.json"),
+            # Session ONNX d'abord : le modèle HF n'est chargé que si elle est indisponible
+            ("session", "onnx_session", None),
+            ("model", "hf_sequence_classifier", None),
+            ("metadata", "json", "metadata.json"),
+        ]
+    },
+    "vulnerability_classifier": {
+        "display_name": "Vulnerability Classifier",
+        "icon": "🔍",
+        "components": [
+            ("model", "torch", "best_model.pth"),
+            ("tokenizer", "json", "tokenizer.json"),
+            ("labels", "json", "label_dict.json"),
+            ("results", "json", "results_summary.json"),
+        ]
+    }
+}
+
+# Longueur fixe des séquences de l'Intent Classifier (formes statiques pour torch.compile/ORT)
+INTENT_MAX_LENGTH = 128
+
+# Empreintes SHA-256 des fichiers téléchargés, une par dossier de modèle
+MANIFEST_NAME = "manifest.json"
+
+# Constantes madvise(2) Linux
+MADV_WILLNEED = 3
+MADV_HUGEPAGE = 14
+
+_libc = None
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Lit un fichier JSON"""
+    return json_loads(Path(path).read_bytes())
+
+def file_sha256(path: Path) -> str:
+    """Empreinte SHA-256 d'un fichier, lu par blocs (hashlib.file_digest si disponible)"""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+def prefetch_file(path: Path) -> None:
+    """Demande au noyau de précharger un fichier en page cache (POSIX_FADV_WILLNEED)"""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+def advise_tensors(tensors) -> None:
+    """Pré-faute les tenseurs CPU et les promeut en huge pages (madvise WILLNEED + HUGEPAGE)"""
+    global _libc
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        if _libc is None:
+            _libc = ctypes.CDLL(None, use_errno=True)
+        page_mask = ~(mmap.PAGESIZE - 1)
+        
+        for tensor in tensors:
+            if not isinstance(tensor, torch.Tensor) or tensor.device.type != "cpu" or tensor.nelement() == 0:
+                continue
+            start = tensor.data_ptr() & page_mask
+            length = tensor.data_ptr() + tensor.element_size() * tensor.nelement() - start
+            for advice in (MADV_WILLNEED, MADV_HUGEPAGE):
+                _libc.madvise(ctypes.c_void_p(start), ctypes.c_size_t(length), advice)
+    except Exception as e:
+        logger.debug(f"madvise ignoré: {e}")
+
 class CompleteModelLoader:
     """Gestionnaire complet pour tous les modèles fine-tunés"""
     
@@ -35,6 +147,21 @@ class CompleteModelLoader:
             "intent_classifier": {"loaded": False, "model_type": "transformers", "task": "intent_classification"},
             "vulnerability_classifier": {"loaded": False, "model_type": "pytorch", "task": "vulnerability_detection"}
         }
+        
+        # Un verrou par modèle : un seul chargement même avec des appelants concurrents
+        self._locks = {name: threading.Lock() for name in self._models_status}
+        
+        # Chargeurs de composants référencés par MODEL_SPECS
+        self._component_loaders = {
+            "pickle": self._read_pickle,
+            "json": self._read_json,
+            "torch": self._read_torch,
+            "preprocessor": self._load_preprocessor,
+            "hf_config": self._read_hf_config,
+            "hf_tokenizer": self._read_hf_tokenizer,
+            "hf_sequence_classifier": self._read_hf_sequence_classifier,
+            "onnx_session": self._build_intent_onnx_session,
+        }
     
     def download_file(self, url: str, local_path: Path) -> bool:
         """Télécharge un fichier depuis une URL"""
@@ -58,187 +185,333 @@ class CompleteModelLoader:
             logger.error(f"❌ Erreur téléchargement {url}: {e}")
             return False
     
-    def load_network_analyzer(self) -> Optional[Dict[str, Any]]:
-        """Charge le Network Analyzer (XGBoost + preprocessing)"""
+    def _load(self, name: str) -> Optional[Dict[str, Any]]:
+        """Charge un modèle une seule fois (double vérification sous verrou)"""
+        if name in self._loaded_models:
+            return self._loaded_models[name]
+        
+        with self._locks[name]:
+            if name in self._loaded_models:
+                return self._loaded_models[name]
+            return self._load_components(name)
+    
+    def _load_components(self, name: str) -> Optional[Dict[str, Any]]:
+        """Télécharge puis charge les composants d'un modèle décrit dans MODEL_SPECS"""
+        spec = MODEL_SPECS[name]
+        display_name = spec["display_name"]
+        
         try:
-            logger.info("🛡️ Chargement du Network Analyzer...")
+            logger.info(f"{spec['icon']} Chargement de {display_name}...")
             
-            model_dir = self.models_dir / "network_analyzer"
+            model_dir = self.models_dir / name
             model_dir.mkdir(exist_ok=True)
             
-            # Fichiers requis
-            files_to_download = {
-                "model": "xgboost_cicids2017_production.pkl",
-                "scaler": "scaler.pkl",
-                "feature_selector": "feature_selector.pkl", 
-                "label_encoder": "label_encoder.pkl",
-                "metadata": "model_metadata.json"
-            }
-            
             # Télécharger les fichiers manquants
-            for file_key, filename in files_to_download.items():
+            downloaded = []
+            for file_key, filename in MODELS_URLS[name]["files"].items():
                 local_path = model_dir / filename
                 if not local_path.exists():
-                    url = get_model_url("network_analyzer", file_key)
+                    url = get_model_url(name, file_key)
                     if not self.download_file(url, local_path):
                         return None
+                    downloaded.append(filename)
+                # Préchargement noyau en parallèle du parsing Python
+                prefetch_file(local_path)
             
-            # Charger les composants
-            model_components = {}
-            
-            # Charger le modèle principal
-            with open(model_dir / "xgboost_cicids2017_production.pkl", 'rb') as f:
-                model_components['model'] = pickle.load(f)
+            if downloaded:
+                self._record_checksums(model_dir, downloaded)
             
-            # Charger le scaler
-            with open(model_dir / "scaler.pkl", 'rb') as f:
-                model_components['scaler'] = pickle.load(f)
-            
-            # Charger le feature selector
-            with open(model_dir / "feature_selector.pkl", 'rb') as f:
-                model_components['feature_selector'] = pickle.load(f)
-            
-            # Charger le label encoder
-            with open(model_dir / "label_encoder.pkl", 'rb') as f:
-                model_components['label_encoder'] = pickle.load(f)
-            
-            # Charger les métadonnées
-            with open(model_dir / "model_metadata.json", 'r') as f:
-                model_components['metadata'] = json.load(f)
+            # Charger les composants dans l'ordre déclaré
+            model_components = {}
+            for component, loader_kind, filename in spec["components"]:
+                loader = self._component_loaders[loader_kind]
+                model_components[component] = loader(model_dir, filename, model_components)
             
-            self._loaded_models['network_analyzer'] = model_components
-            self._models_status['network_analyzer']['loaded'] = True
+            self._loaded_models[name] = model_components
+            self._models_status[name]['loaded'] = True
             
-            logger.info("✅ Network Analyzer chargé avec succès")
+            logger.info(f"✅ {display_name} chargé avec succès")
             return model_components
             
         except Exception as e:
-            logger.error(f"❌ Erreur chargement Network Analyzer: {e}")
+            logger.error(f"❌ Erreur chargement {display_name}: {e}")
             return None
     
+    def _record_checksums(self, model_dir: Path, filenames: List[str]) -> None:
+        """Enregistre taille et SHA-256 des fichiers téléchargés dans le manifeste du modèle"""
+        manifest_path = model_dir / MANIFEST_NAME
+        manifest = read_json(manifest_path) if manifest_path.exists() else {}
+        for filename in filenames:
+            local_path = model_dir / filename
+            manifest[filename] = {"size": local_path.stat().st_size, "sha256": file_sha256(local_path)}
+        manifest_path.write_bytes(json_dumps(manifest, indent=True))
+    
+    def verify_model(self, name: str) -> Dict[str, Any]:
+        """Vérifie l'intégrité des fichiers d'un modèle sans le charger
+        
+        Présence des fichiers, taille et SHA-256 comparés au manifeste, et parsing des
+        fichiers JSON : aucun poids n'est désérialisé ni aucune inférence exécutée.
+        """
+        model_dir = self.models_dir / name
+        manifest_path = model_dir / MANIFEST_NAME
+        manifest = read_json(manifest_path) if manifest_path.exists() else {}
+        result = {"valid": True, "errors": [], "unverified": []}
+        
+        for filename in MODELS_URLS[name]["files"].values():
+            local_path = model_dir / filename
+            if not local_path.exists():
+                result["errors"].append(f"{filename}: fichier manquant")
+                continue
+            
+            expected = manifest.get(filename)
+            if expected is None:
+                result["unverified"].append(filename)
+            elif local_path.stat().st_size != expected["size"]:
+                result["errors"].append(f"{filename}: taille inattendue")
+            elif file_sha256(local_path) != expected["sha256"]:
+                result["errors"].append(f"{filename}: empreinte SHA-256 différente")
+            
+            if local_path.suffix == ".json":
+                try:
+                    read_json(local_path)
+                except ValueError as e:
+                    result["errors"].append(f"{filename}: JSON invalide ({e})")
+        
+        result["valid"] = not result["errors"]
+        return result
+    
+    def verify_all_models(self) -> Dict[str, Dict[str, Any]]:
+        """Vérifie l'intégrité de tous les modèles (contrôle rapide, sans chargement)"""
+        results = {name: self.verify_model(name) for name in MODEL_SPECS}
+        valid_count = sum(result["valid"] for result in results.values())
+        logger.info(f"🔐 Modèles intègres: {valid_count}/{len(results)}")
+        return results
+    
+    def load_network_analyzer(self) -> Optional[Dict[str, Any]]:
+        """Charge le Network Analyzer (XGBoost + preprocessing)"""
+        return self._load('network_analyzer')
+    
     def load_intent_classifier(self) -> Optional[Dict[str, Any]]:
         """Charge l'Intent Classifier (BERT fine-tuné)"""
-        try:
-            logger.info("🧠 Chargement de l'Intent Classifier...")
-            
-            model_dir = self.models_dir / "intent_classifier"
-            model_dir.mkdir(exist_ok=True)
-            
-            # Fichiers requis
-            files_to_download = {
-                "model": "pytorch_model.bin",
-                "config": "config.json",
-                "tokenizer": "tokenizer.json",
-                "vocab": "vocab.txt",
-                "labels": "intent_labels.json",
-                "metadata": "metadata.json"
-            }
-            
-            # Télécharger les fichiers manquants
-            for file_key, filename in files_to_download.items():
-                local_path = model_dir / filename
-                if not local_path.exists():
-                    url = get_model_url("intent_classifier", file_key)
-                    if not self.download_file(url, local_path):
-                        return None
-            
-            # Charger les composants
-            model_components = {}
-            
-            # Charger la configuration
-            with open(model_dir / "config.json", 'r') as f:
-                config_data = json.load(f)
-                model_components['config'] = AutoConfig.from_pretrained(model_dir)
-            
-            # Charger le tokenizer
-            model_components['tokenizer'] = AutoTokenizer.from_pretrained(model_dir)
-            
-            # Charger le modèle
-            model_components['model'] = AutoModel.from_pretrained(model_dir)
-            
-            # Charger les labels
-            with open(model_dir / "intent_labels.json", 'r') as f:
-                model_components['labels'] = json.load(f)
-            
-            # Charger les métadonnées
-            with open(model_dir / "metadata.json", 'r') as f:
-                model_components['metadata'] = json.load(f)
-            
-            self._loaded_models['intent_classifier'] = model_components
-            self._models_status['intent_classifier']['loaded'] = True
-            
-            logger.info("✅ Intent Classifier chargé avec succès")
-            return model_components
-            
-        except Exception as e:
-            logger.error(f"❌ Erreur chargement Intent Classifier: {e}")
-            return None
+        return self._load('intent_classifier')
     
     def load_vulnerability_classifier(self) -> Optional[Dict[str, Any]]:
         """Charge le Vulnerability Classifier (PyTorch)"""
+        return self._load('vulnerability_classifier')
+    
+    def _read_pickle(self, model_dir: Path, filename: str, components: Dict[str, Any]) -> Any:
+        """Charge un objet picklé (tableaux numpy mappés en lecture seule s'ils ont été écrits par joblib)"""
+        # mmap_mode='r' : pages chargées à la demande et partagées entre workers ;
+        # les pickles standards sont relus normalement par joblib
+        return self._compact_linear_weights(joblib.load(model_dir / filename, mmap_mode='r'))
+    
+    @staticmethod
+    def _compact_linear_weights(model: Any) -> Any:
+        """Passe en float32 les poids des modèles linéaires scikit-learn (moitié moins de bande passante)"""
         try:
-            logger.info("🔍 Chargement du Vulnerability Classifier...")
-            
-            model_dir = self.models_dir / "vulnerability_classifier"
-            model_dir.mkdir(exist_ok=True)
-            
-            # Fichiers requis
-            files_to_download = {
-                "model": "best_model.pth",
-                "tokenizer": "tokenizer.json",
-                "labels": "label_dict.json",
-                "results": "results_summary.json"
-            }
-            
-            # Télécharger les fichiers manquants
-            for file_key, filename in files_to_download.items():
-                local_path = model_dir / filename
-                if not local_path.exists():
-                    url = get_model_url("vulnerability_classifier", file_key)
-                    if not self.download_file(url, local_path):
-                        return None
-            
-            # Charger les composants
-            model_components = {}
-            
-            # Charger le modèle PyTorch
-            model_components['model'] = torch.load(
-                model_dir / "best_model.pth", 
-                map_location=torch.device('cpu')
+            from sklearn.linear_model._base import LinearClassifierMixin, LinearModel
+        except ImportError:
+            return model
+        
+        # Les modèles à arbres (XGBoost...) n'ont pas de matrice de poids : inchangés
+        if not isinstance(model, (LinearClassifierMixin, LinearModel)):
+            return model
+        
+        for attr in ("coef_", "intercept_"):
+            value = getattr(model, attr, None)
+            if isinstance(value, np.ndarray) and value.dtype == np.float64:
+                setattr(model, attr, value.astype(np.float32))
+        return model
+    
+    def _read_json(self, model_dir: Path, filename: str, components: Dict[str, Any]) -> Any:
+        """Charge un fichier JSON"""
+        return read_json(model_dir / filename)
+    
+    def _read_torch(self, model_dir: Path, filename: str, components: Dict[str, Any]) -> Any:
+        """Charge un modèle PyTorch sur CPU"""
+        loaded = torch.load(model_dir / filename, map_location=torch.device('cpu'))
+        advise_tensors(loaded.state_dict().values() if hasattr(loaded, "state_dict") else
+                       loaded.values() if isinstance(loaded, dict) else [])
+        return loaded
+    
+    def _read_hf_config(self, model_dir: Path, filename: Optional[str], components: Dict[str, Any]) -> Any:
+        """Charge la configuration Transformers"""
+        return AutoConfig.from_pretrained(model_dir)
+    
+    def _read_hf_tokenizer(self, model_dir: Path, filename: Optional[str], components: Dict[str, Any]) -> Any:
+        """Charge le tokenizer (implémentation Rust rapide)"""
+        return AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+    
+    def _read_hf_sequence_classifier(self, model_dir: Path, filename: Optional[str],
+                                     components: Dict[str, Any]) -> Any:
+        """Charge le modèle avec sa tête de classification (pooling + linéaire fusionnés)
+        
+        Aucun modèle HF n'est chargé lorsque la session ONNX est disponible.
+        """
+        if components.get('session') is not None:
+            return None
+        model = AutoModelForSequenceClassification.from_pretrained(
+            model_dir,
+            num_labels=len(components['labels']),
+            torch_dtype=self._cpu_inference_dtype(),
+            low_cpu_mem_usage=True
+        ).eval()
+        advise_tensors(model.state_dict().values())
+        if hasattr(torch, "compile"):
+            # Compilation paresseuse : le coût est payé au premier appel
+            model = torch.compile(model)
+        return model
+    
+    def _load_preprocessor(self, model_dir: Path, filename: str, components: Dict[str, Any]) -> Any:
+        """Charge un préprocesseur depuis safetensors (mmap), en migrant le pickle au premier chargement"""
+        st_dir = model_dir / f"{Path(filename).stem}.safetensors.d"
+        
+        try:
+            from safetensors.numpy import load_file, save_file
+        except ImportError:
+            load_file = save_file = None
+        
+        if load_file is not None and (st_dir / "meta.json").exists():
+            try:
+                meta = read_json(st_dir / "meta.json")
+                cls = PREPROCESSOR_SPECS[meta["type"]][0]
+                obj = cls()
+                for attr, value in meta["attributes"].items():
+                    setattr(obj, attr, np.asarray(value, dtype=object) if isinstance(value, list) else value)
+                tensors_path = st_dir / "tensors.safetensors"
+                if tensors_path.exists():
+                    for attr, array in load_file(str(tensors_path)).items():
+                        setattr(obj, attr, array)
+                return obj
+            except Exception as e:
+                logger.warning(f"⚠️ Cache safetensors invalide pour {filename}, relecture du pickle: {e}")
+        
+        with open(model_dir / filename, 'rb') as f:
+            obj = pickle.load(f)
+        
+        spec = PREPROCESSOR_SPECS.get(type(obj).__name__)
+        if save_file is not None and spec is not None:
+            try:
+                _, array_attrs, meta_attrs = spec
+                tensors, attributes = {}, {}
+                for attr in dict.fromkeys(array_attrs + meta_attrs + ("feature_names_in_",)):
+                    value = getattr(obj, attr, None)
+                    if value is None:
+                        continue
+                    if isinstance(value, np.ndarray) and value.dtype.kind in "biuf":
+                        tensors[attr] = np.ascontiguousarray(value)
+                    else:
+                        attributes[attr] = value.tolist() if hasattr(value, "tolist") else value
+                
+                st_dir.mkdir(exist_ok=True)
+                if tensors:
+                    save_file(tensors, str(st_dir / "tensors.safetensors"))
+                (st_dir / "meta.json").write_bytes(
+                    json_dumps({"type": type(obj).__name__, "attributes": attributes})
+                )
+                logger.info(f"✅ {filename} migré vers safetensors")
+            except Exception as e:
+                logger.warning(f"⚠️ Migration safetensors impossible pour {filename}: {e}")
+        
+        return obj
+    
+    @staticmethod
+    def _cpu_inference_dtype() -> torch.dtype:
+        """bfloat16 si le CPU le supporte nativement (AVX512-BF16/AMX), sinon float32"""
+        try:
+            if torch.ops.mkldnn._is_mkldnn_bf16_supported():
+                return torch.bfloat16
+        except Exception:
+            pass
+        return torch.float32
+    
+    def _build_intent_onnx_session(self, model_dir: Path, filename: Optional[str],
+                                   components: Dict[str, Any]) -> Optional[Any]:
+        """Exporte l'Intent Classifier en ONNX quantifié int8 et ouvre une session ORT"""
+        tokenizer = components['tokenizer']
+        try:
+            import onnxruntime as ort
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError:
+            logger.warning("onnxruntime non installé, inférence ONNX désactivée")
+            return None
+        
+        try:
+            onnx_path = model_dir / "intent_classifier.onnx"
+            
+            # Export unique, mis en cache à côté des poids HF
+            if not onnx_path.exists():
+                logger.info("🔧 Export ONNX de l'Intent Classifier...")
+                # Copie float32 non compilée, dédiée à l'export, avec la même tête que le modèle servi
+                export_model = AutoModelForSequenceClassification.from_pretrained(
+                    model_dir,
+                    num_labels=len(components['labels'])
+                ).eval()
+                dummy = tokenizer(
+                    "export",
+                    padding="max_length",
+                    truncation=True,
+                    max_length=INTENT_MAX_LENGTH,
+                    return_tensors="pt"
+                )
+                fp32_path = model_dir / "intent_classifier.fp32.onnx"
+                temp_path = model_dir / "intent_classifier.tmp.onnx"
+                
+                try:
+                    with torch.no_grad():
+                        torch.onnx.export(
+                            export_model,
+                            (dummy["input_ids"], dummy["attention_mask"]),
+                            str(fp32_path),
+                            input_names=["input_ids", "attention_mask"],
+                            output_names=["logits"],
+                            dynamic_axes={
+                                "input_ids": {0: "batch", 1: "sequence"},
+                                "attention_mask": {0: "batch", 1: "sequence"},
+                                "logits": {0: "batch"}
+                            },
+                            opset_version=17
+                        )
+                    del export_model
+                    
+                    # Quantification dans un fichier temporaire puis os.replace : un arrêt en cours
+                    # d'écriture ne laisse jamais un intent_classifier.onnx tronqué
+                    quantize_dynamic(str(fp32_path), str(temp_path), weight_type=QuantType.QInt8)
+                    os.replace(temp_path, onnx_path)
+                finally:
+                    fp32_path.unlink(missing_ok=True)
+                    temp_path.unlink(missing_ok=True)
+                logger.info(f"✅ Modèle ONNX int8 enregistré: {onnx_path}")
+            
+            sess_options = ort.SessionOptions()
+            sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            sess_options.intra_op_num_threads = os.cpu_count() or 1
+            
+            return ort.InferenceSession(
+                str(onnx_path),
+                sess_options=sess_options,
+                providers=["CPUExecutionProvider"]
             )
             
-            # Charger le tokenizer
-            with open(model_dir / "tokenizer.json", 'r') as f:
-                model_components['tokenizer'] = json.load(f)
-            
-            # Charger les labels
-            with open(model_dir / "label_dict.json", 'r') as f:
-                model_components['labels'] = json.load(f)
-            
-            # Charger les résultats
-            with open(model_dir / "results_summary.json", 'r') as f:
-                model_components['results'] = json.load(f)
-            
-            self._loaded_models['vulnerability_classifier'] = model_components
-            self._models_status['vulnerability_classifier']['loaded'] = True
-            
-            logger.info("✅ Vulnerability Classifier chargé avec succès")
-            return model_components
-            
         except Exception as e:
-            logger.error(f"❌ Erreur chargement Vulnerability Classifier: {e}")
+            logger.error(f"❌ Erreur export ONNX Intent Classifier: {e}")
             return None
     
     def load_all_models(self) -> Dict[str, bool]:
         """Charge tous les modèles"""
         logger.info("🚀 Chargement de tous les modèles...")
         
-        results = {}
+        loaders = {
+            'network_analyzer': self.load_network_analyzer,
+            'intent_classifier': self.load_intent_classifier,
+            'vulnerability_classifier': self.load_vulnerability_classifier,
+        }
         
-        # Charger chaque modèle
-        results['network_analyzer'] = self.load_network_analyzer() is not None
-        results['intent_classifier'] = self.load_intent_classifier() is not None
-        results['vulnerability_classifier'] = self.load_vulnerability_classifier() is not None
+        # Charger les modèles en parallèle : téléchargements, lectures disque et désérialisation
+        # torch/numpy (qui relâchent le GIL) se recouvrent ; les verrous par modèle évitent les doublons
+        with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="model-loader") as executor:
+            futures = {name: executor.submit(loader) for name, loader in loaders.items()}
+            results = {name: future.result() is not None for name, future in futures.items()}
         
         success_count = sum(results.values())
         total_count = len(results)
@@ -271,28 +544,68 @@ class CompleteModelLoader:
     
     def classify_intent(self, text: str) -> Dict[str, Any]:
         """Classifie l'intention d'un texte"""
+        if 'intent_classifier' not in self._loaded_models:
+            return {"error": "Intent Classifier non chargé"}
+        
+        return self.classify_intent_batch([text])[0]
+    
+    def classify_intent_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Classifie l'intention de plusieurs textes en une seule passe"""
         try:
             if 'intent_classifier' not in self._loaded_models:
-                return {"error": "Intent Classifier non chargé"}
+                return [{"error": "Intent Classifier non chargé"} for _ in texts]
             
-            components = self._loaded_models['intent_classifier']
+            if not texts:
+                return []
             
-            # Simulation de classification (remplacer par vraie logique)
-            prediction = {
-                "predicted_intent": "support_request",
-                "confidence": 0.87,
-                "all_scores": {
-                    "support_request": 0.87,
-                    "security_issue": 0.10,
-                    "general_inquiry": 0.03
-                }
-            }
+            components = self._loaded_models['intent_classifier']
+            session = components.get('session')
+            
+            encoded = components['tokenizer'](
+                texts,
+                padding="max_length",
+                truncation=True,
+                max_length=INTENT_MAX_LENGTH,
+                return_tensors="np" if session is not None else "pt"
+            )
             
-            return prediction
+            if session is not None:
+                # Inférence ONNX Runtime, sans passer par le modèle HF
+                logits = session.run(
+                    ["logits"],
+                    {
+                        "input_ids": encoded["input_ids"].astype(np.int64),
+                        "attention_mask": encoded["attention_mask"].astype(np.int64)
+                    }
+                )[0]
+            else:
+                # Une seule passe avant pour tout le lot
+                with torch.inference_mode():
+                    logits = components['model'](**encoded).logits.float().numpy()
+            
+            return [self._format_intent_scores(row, components['labels']) for row in logits]
             
         except Exception as e:
             logger.error(f"Erreur classification intention: {e}")
-            return {"error": str(e)}
+            return [{"error": str(e)} for _ in texts]
+    
+    @staticmethod
+    def _format_intent_scores(logits: np.ndarray, labels: Union[List[str], Dict[str, str]]) -> Dict[str, Any]:
+        """Convertit des logits en intention prédite + scores softmax"""
+        exp = np.exp(logits - np.max(logits))
+        probs = exp / exp.sum()
+        
+        if isinstance(labels, dict):
+            names = [labels.get(str(i), f"LABEL_{i}") for i in range(len(probs))]
+        else:
+            names = [labels[i] if i < len(labels) else f"LABEL_{i}" for i in range(len(probs))]
+        
+        best = int(np.argmax(probs))
+        return {
+            "predicted_intent": names[best],
+            "confidence": float(probs[best]),
+            "all_scores": {name: float(p) for name, p in zip(names, probs)}
+        }
     
     def detect_vulnerability(self, payload: str) -> Dict[str, Any]:
         """Détecte les vulnérabilités dans un payload"""
@@ -2,16 +2,91 @@
 Module pour gérer le crawling de sites web avec crawl4ai.
 """
 import os
-import json
+import sys
+import asyncio
+import functools
+import importlib.util
+import hashlib
 import subprocess
-from typing import List, Dict, Any, Optional, Union
+import threading
+from operator import itemgetter
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Union, Iterator, AsyncIterator
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import requests
+import ijson
 
 from config.logging_config import get_logger
 from config.settings import settings
+from utils.json_utils import json_dumps, json_loads
 
 logger = get_logger("crawl_manager")
 
+# Extraction en un seul appel C des deux champs obligatoires d'une page crawlée
+_page_content_and_url = itemgetter("content", "url")
+
+@functools.lru_cache(maxsize=1)
+def _crawl4ai_installed() -> bool:
+    """
+    Vérifie une seule fois par processus si crawl4ai est importable.
+    
+    Returns:
+        True si crawl4ai est installé, False sinon
+    """
+    installed = importlib.util.find_spec("crawl4ai") is not None
+    if installed:
+        logger.info("crawl4ai est installé")
+    else:
+        logger.warning("crawl4ai n'est pas installé. Exécutez 'pip install crawl4ai'")
+    return installed
+
+@functools.lru_cache(maxsize=4096)
+def _url_hash(url: str) -> str:
+    """
+    Empreinte courte (10 caractères hexadécimaux) d'une URL pour nommer les fichiers.
+    
+    Args:
+        url: URL crawlée
+        
+    Returns:
+        Empreinte BLAKE2b de 5 octets
+    """
+    return hashlib.blake2b(url.encode(), digest_size=5).hexdigest()
+
+@functools.lru_cache(maxsize=4096)
+def _canonicalize_url(url: str) -> str:
+    """
+    Forme canonique d'une URL pour détecter les doublons et alias.
+    
+    Schéma et hôte en minuscules, port par défaut et fragment retirés,
+    paramètres de requête triés et slash final ignoré.
+    
+    Args:
+        url: URL à normaliser
+        
+    Returns:
+        URL canonique
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+def _content_fingerprint(content: Union[str, bytes]) -> str:
+    """
+    Empreinte BLAKE2b du contenu d'une page, pour repérer les pages inchangées.
+    
+    Toujours calculée sur le markdown rendu (page["content"]), quel que soit le
+    chemin de récupération : les empreintes de .seen.json restent comparables.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
 class Crawl4AIManager:
     """
     Gestionnaire pour l'outil crawl4ai.
@@ -20,24 +95,101 @@ class Crawl4AIManager:
     de sites web et les préparer pour l'ingestion dans la base de connaissances.
     """
     
-    def __init__(self, output_dir: str = "data/crawled_data"):
+    def __init__(self, output_dir: str = "data/crawled_data", sink_file: Optional[str] = None):
         """
         Initialise le gestionnaire crawl4ai.
         
         Args:
             output_dir: Répertoire de sortie pour les données crawlées
+            sink_file: Fichier JSONL unique recevant toutes les pages crawlées au format
+                jsonl, au lieu d'un fichier par URL (optionnel)
         """
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
-        # Vérifier si crawl4ai est installé
-        try:
-            subprocess.run(["crawl4ai", "--version"], capture_output=True, text=True)
-            self.is_installed = True
-            logger.info("crawl4ai est installé")
-        except FileNotFoundError:
-            self.is_installed = False
-            logger.warning("crawl4ai n'est pas installé. Exécutez 'pip install crawl4ai'")
+        # Fichier collecteur JSONL, ouvert en ajout à la première écriture
+        self.sink_file = sink_file
+        self._sink_fd: Optional[int] = None
+        self._sink_lock = threading.Lock()
+        
+        # Disponibilité de crawl4ai, vérifiée à la première utilisation
+        self._is_installed: Optional[bool] = None
+        self._install_lock: Optional[asyncio.Lock] = None
+        
+        # URLs déjà crawlées (URL canonique -> empreinte, validateurs HTTP, fichier)
+        self._seen_path = os.path.join(output_dir, ".seen.json")
+        self._seen: Optional[Dict[str, Dict[str, str]]] = None
+    
+    @property
+    def seen(self) -> Dict[str, Dict[str, str]]:
+        """Index persistant des pages déjà crawlées, chargé à la première utilisation."""
+        if self._seen is None:
+            try:
+                with open(self._seen_path, "rb") as f:
+                    self._seen = json_loads(f.read())
+            except FileNotFoundError:
+                self._seen = {}
+            except Exception as e:
+                logger.warning(f"Index des URLs vues illisible, réinitialisation: {e}")
+                self._seen = {}
+        return self._seen
+    
+    def save_seen(self) -> None:
+        """Enregistre l'index des pages déjà crawlées."""
+        if self._seen is None:
+            return
+        temp_file = f"{self._seen_path}.tmp"
+        with open(temp_file, "wb") as f:
+            f.write(json_dumps(self._seen))
+        os.replace(temp_file, self._seen_path)
+    
+    def _unchanged_output(self, url: str, fingerprint: str) -> Optional[str]:
+        """
+        Renvoie le fichier existant d'une page dont le contenu n'a pas changé.
+        
+        Args:
+            url: URL crawlée
+            fingerprint: Empreinte du markdown rendu (_content_fingerprint)
+            
+        Returns:
+            Chemin du fichier déjà écrit, ou None si la page doit être (ré)écrite
+        """
+        entry = self.seen.get(_canonicalize_url(url))
+        if entry and entry.get("fingerprint") == fingerprint and os.path.exists(entry.get("output_file", "")):
+            return entry["output_file"]
+        return None
+    
+    def _remember(self, url: str, fingerprint: str, output_file: str, headers: Optional[Any] = None) -> None:
+        """Enregistre l'empreinte (et les validateurs HTTP éventuels) d'une page écrite."""
+        entry = {"fingerprint": fingerprint, "output_file": output_file}
+        if headers is not None:
+            for header, key in (("etag", "etag"), ("last-modified", "last_modified")):
+                if headers.get(header):
+                    entry[key] = headers[header]
+        self.seen[_canonicalize_url(url)] = entry
+    
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """En-têtes de revalidation HTTP (If-None-Match / If-Modified-Since) d'une page connue."""
+        entry = self.seen.get(_canonicalize_url(url))
+        if not entry or not os.path.exists(entry.get("output_file", "")):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    @property
+    def is_installed(self) -> bool:
+        """Indique si crawl4ai est installé (vérifié paresseusement, une fois par processus)."""
+        if self._is_installed is None:
+            self._is_installed = _crawl4ai_installed()
+        return self._is_installed
+    
+    @is_installed.setter
+    def is_installed(self, value: bool) -> None:
+        self._is_installed = value
     
     def install_crawl4ai(self) -> bool:
         """
@@ -53,6 +205,7 @@ class Crawl4AIManager:
         try:
             logger.info("Installation de crawl4ai...")
             subprocess.run(["pip", "install", "crawl4ai"], check=True)
+            _crawl4ai_installed.cache_clear()
             self.is_installed = True
             logger.info("crawl4ai a été installé avec succès")
             return True
@@ -60,66 +213,452 @@ class Crawl4AIManager:
             logger.error(f"Erreur lors de l'installation de crawl4ai: {e}")
             return False
     
-    def crawl_url(self, url: str, depth: int = 2, output_format: str = "json") -> str:
+    def _ensure_installed(self) -> bool:
+        """
+        Vérifie que crawl4ai est disponible, en l'installant si nécessaire.
+        
+        Returns:
+            True si crawl4ai est utilisable, False sinon
+        """
+        if not self.is_installed:
+            if not self.install_crawl4ai():
+                logger.error("Impossible d'installer crawl4ai")
+                return False
+        return True
+    
+    async def ainstall_crawl4ai(self) -> bool:
+        """
+        Variante asynchrone de install_crawl4ai : pip tourne dans un processus
+        enfant (asyncio.create_subprocess_exec) sans bloquer la boucle asyncio.
+        
+        Returns:
+            True si l'installation a réussi, False sinon
+        """
+        if self.is_installed:
+            return True
+        
+        try:
+            logger.info("Installation de crawl4ai...")
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "pip", "install", "crawl4ai",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                logger.error(f"Erreur lors de l'installation de crawl4ai: {stderr.decode(errors='replace').strip()}")
+                return False
+            
+            _crawl4ai_installed.cache_clear()
+            self.is_installed = True
+            logger.info("crawl4ai a été installé avec succès")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de l'installation de crawl4ai: {e}")
+            return False
+    
+    async def _aensure_installed(self) -> bool:
+        """
+        Variante asynchrone de _ensure_installed : une éventuelle installation
+        s'exécute hors de la boucle asyncio, une seule fois pour les crawls concurrents.
+        
+        Returns:
+            True si crawl4ai est utilisable, False sinon
+        """
+        if self.is_installed:
+            return True
+        
+        if self._install_lock is None:
+            self._install_lock = asyncio.Lock()
+        async with self._install_lock:
+            if await self.ainstall_crawl4ai():
+                return True
+        
+        logger.error("Impossible d'installer crawl4ai")
+        return False
+    
+    async def crawl_url(self, url: str, depth: int = 2, output_format: str = "jsonl",
+                        crawler: Optional[Any] = None, crawled_at: Optional[str] = None) -> str:
         """
-        Crawle une URL avec crawl4ai.
+        Crawle une URL avec l'API Python de crawl4ai (AsyncWebCrawler).
         
         Args:
             url: URL à crawler
-            depth: Profondeur du crawling
-            output_format: Format de sortie (json, md, txt)
+            depth: Profondeur du crawling (1 = uniquement la page demandée)
+            output_format: Format de sortie (jsonl, json, md, txt)
+            crawler: AsyncWebCrawler déjà démarré à réutiliser (optionnel)
+            crawled_at: Horodatage ISO partagé par le lot de crawl (optionnel)
             
         Returns:
             Chemin du fichier de sortie
         """
-        if not self.is_installed:
-            if not self.install_crawl4ai():
-                logger.error("Impossible d'installer crawl4ai")
-                return ""
+        if not await self._aensure_installed():
+            return ""
+        
+        from crawl4ai import AsyncWebCrawler
+        from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
         
-        # Créer un nom de fichier basé sur l'URL
-        import hashlib
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:10]
-        output_file = os.path.join(self.output_dir, f"crawled_{url_hash}.{output_format}")
+        output_file = self._output_path(url, output_format)
         
         try:
             logger.info(f"Crawling de {url} avec une profondeur de {depth}...")
             
-            # Exécuter crawl4ai
-            cmd = [
-                "crawl4ai",
-                "crawl",
-                "--url", url,
-                "--depth", str(depth),
-                "--output", output_file,
-                "--format", output_format
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                logger.info(f"Crawling terminé avec succès. Résultats enregistrés dans {output_file}")
-                return output_file
+            # Les niveaux au-delà de la page de départ sont confiés au crawl BFS
+            config = self._run_config(
+                deep_crawl_strategy=BFSDeepCrawlStrategy(max_depth=depth - 1) if depth > 1 else None
+            )
+            
+            if crawler is not None:
+                results = await crawler.arun(url=url, config=config)
             else:
-                logger.error(f"Erreur lors du crawling: {result.stderr}")
+                async with AsyncWebCrawler(verbose=False) as own_crawler:
+                    results = await own_crawler.arun(url=url, config=config)
+            
+            if not isinstance(results, list):
+                results = [results]
+            
+            # Un seul horodatage pour toutes les pages du crawl
+            crawled_at = crawled_at or datetime.now().isoformat()
+            pages = [self._result_to_page(result, crawled_at) for result in results if result.success]
+            
+            if not pages:
+                errors = "; ".join(str(result.error_message) for result in results)
+                logger.error(f"Erreur lors du crawling: {errors}")
                 return ""
+            
+            await self._awrite_output(output_file, pages, output_format)
+            logger.info(f"Crawling terminé avec succès. Résultats enregistrés dans {output_file}")
+            return output_file
         except Exception as e:
             logger.error(f"Exception lors du crawling: {e}")
             return ""
     
-    def crawl_multiple_urls(self, base_url: str, paths: List[str], depth: int = 1) -> List[str]:
+    def _run_config(self, **kwargs) -> Any:
+        """
+        Construit la configuration de crawl commune.
+        
+        Le parsing HTML passe par LXMLWebScrapingStrategy (bien plus rapide que
+        le parseur par défaut) et les re-crawls profitent du cache crawl4ai.
+        
+        Args:
+            **kwargs: Options supplémentaires de CrawlerRunConfig
+            
+        Returns:
+            CrawlerRunConfig prêt à l'emploi
+        """
+        from crawl4ai import CrawlerRunConfig, CacheMode, LXMLWebScrapingStrategy
+        
+        return CrawlerRunConfig(
+            cache_mode=CacheMode.ENABLED,
+            scraping_strategy=LXMLWebScrapingStrategy(),
+            **kwargs
+        )
+    
+    def crawl_url_sync(self, url: str, depth: int = 2, output_format: str = "jsonl") -> str:
+        """
+        Variante synchrone de crawl_url pour les appelants hors boucle asyncio.
+        
+        Args:
+            url: URL à crawler
+            depth: Profondeur du crawling
+            output_format: Format de sortie (jsonl, json, md, txt)
+            
+        Returns:
+            Chemin du fichier de sortie
+        """
+        return asyncio.run(self.crawl_url(url, depth, output_format))
+    
+    def _output_path(self, url: str, output_format: str) -> str:
+        """
+        Construit le chemin du fichier de sortie à partir de l'URL.
+        
+        Args:
+            url: URL crawlée
+            output_format: Format de sortie (jsonl, json, md, txt)
+            
+        Returns:
+            Chemin du fichier de sortie
+        """
+        if self.sink_file and output_format == "jsonl":
+            return self.sink_file
+        return os.path.join(self.output_dir, f"crawled_{_url_hash(url)}.{output_format}")
+    
+    def _result_to_page(self, result: Any, crawled_at: str, url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Convertit un CrawlResult en page au format attendu par process_crawled_data.
+        
+        Args:
+            result: Résultat renvoyé par AsyncWebCrawler.arun
+            crawled_at: Horodatage ISO du crawl
+            url: URL d'origine, si le résultat provient d'un HTML brut (optionnel)
+            
+        Returns:
+            Dictionnaire de la page (url, title, content, timestamp)
+        """
+        metadata = result.metadata or {}
+        return {
+            "url": url or result.url,
+            "title": metadata.get("title", ""),
+            "content": str(result.markdown or ""),
+            "timestamp": crawled_at
+        }
+    
+    def _write_output(self, output_file: str, pages: List[Dict[str, Any]], output_format: str) -> None:
+        """
+        Écrit les pages crawlées directement depuis la mémoire.
+        
+        Args:
+            output_file: Chemin du fichier de sortie
+            pages: Pages crawlées
+            output_format: Format de sortie (jsonl, json, md, txt)
+        """
+        if output_file == self.sink_file and output_format == "jsonl":
+            self._append_to_sink(pages)
+            return
+        
+        # Écriture dans un fichier temporaire du même répertoire puis os.replace :
+        # simple renommage (aucune copie) et jamais de fichier à moitié écrit
+        temp_file = f"{output_file}.tmp"
+        with open(temp_file, "wb") as f:
+            if output_format == "jsonl":
+                # Une page par ligne : relecture en streaming sans parseur incrémental
+                f.writelines(json_dumps(page) + b"\n" for page in pages)
+            elif output_format == "json":
+                f.write(json_dumps(pages))
+            else:
+                f.write("\n\n".join(page["content"] for page in pages).encode("utf-8"))
+        os.replace(temp_file, output_file)
+    
+    def _append_to_sink(self, pages: List[Dict[str, Any]]) -> None:
+        """
+        Ajoute des pages au fichier collecteur JSONL.
+        
+        Le descripteur reste ouvert (O_APPEND) entre les écritures et chaque lot
+        est concaténé en un seul tampon : un appel os.write suffit en général
+        (pas de limite IOV_MAX comme avec os.writev), les écritures partielles
+        sont reprises jusqu'à la fin du tampon.
+        
+        Args:
+            pages: Pages crawlées
+        """
+        data = memoryview(b"".join(json_dumps(page) + b"\n" for page in pages))
+        
+        with self._sink_lock:
+            if self._sink_fd is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.sink_file)), exist_ok=True)
+                self._sink_fd = os.open(self.sink_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            while data:
+                written = os.write(self._sink_fd, data)
+                data = data[written:]
+    
+    def close(self) -> None:
+        """Ferme le fichier collecteur JSONL s'il est ouvert."""
+        with self._sink_lock:
+            if self._sink_fd is not None:
+                os.close(self._sink_fd)
+                self._sink_fd = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    async def _awrite_output(self, output_file: str, pages: List[Dict[str, Any]], output_format: str) -> None:
+        """Variante asynchrone de _write_output : l'écriture disque s'exécute hors de la boucle asyncio."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_output, output_file, pages, output_format)
+    
+    async def crawl_many(self, urls: List[str], depth: int = 1, concurrency: int = 20,
+                         output_format: str = "jsonl") -> List[str]:
         """
-        Crawle plusieurs chemins d'un site web.
+        Crawle plusieurs URLs en parallèle avec un seul navigateur partagé.
+        
+        Args:
+            urls: URLs à crawler
+            depth: Profondeur du crawling
+            concurrency: Nombre maximal de crawls simultanés
+            output_format: Format de sortie (jsonl, json, md, txt)
+            
+        Returns:
+            Chemins des fichiers de sortie, dans l'ordre des URLs ("" en cas d'échec)
+        """
+        if not urls or not await self._aensure_installed():
+            return []
+        
+        from crawl4ai import AsyncWebCrawler
+        
+        crawled_at = datetime.now().isoformat()
+        
+        # Un seul AsyncWebCrawler pour tout le lot : le démarrage du navigateur est amorti
+        async with AsyncWebCrawler(verbose=False) as crawler:
+            if depth <= 1:
+                return await self._stream_many(crawler, urls, concurrency, output_format, crawled_at)
+            
+            # Les crawls en profondeur restent un crawl_url par URL de départ
+            semaphore = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*[
+                self._crawl_bounded(url, semaphore, crawler, depth, output_format, crawled_at)
+                for url in urls
+            ])
+    
+    async def _stream_many(self, crawler: Any, urls: List[str], concurrency: int,
+                           output_format: str, crawled_at: str) -> List[str]:
+        """
+        Crawle un lot d'URLs avec arun_many en streaming, sous contrôle mémoire.
+        
+        Chaque page est écrite dès sa réception : la mémoire de pointe reste
+        limitée à une page au lieu du lot entier.
+        
+        Args:
+            crawler: AsyncWebCrawler démarré
+            urls: URLs à crawler
+            concurrency: Nombre maximal de sessions simultanées
+            output_format: Format de sortie (jsonl, json, md, txt)
+            crawled_at: Horodatage ISO du lot
+            
+        Returns:
+            Chemins des fichiers de sortie, dans l'ordre des URLs ("" en cas d'échec)
+        """
+        from crawl4ai import MemoryAdaptiveDispatcher
+        
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=80.0,
+            max_session_permit=concurrency,
+            check_interval=0.5
+        )
+        config = self._run_config(stream=True)
+        
+        # Résultats indexés par URL canonique : result.url peut différer de l'URL
+        # demandée par sa forme (slash final, casse de l'hôte, ordre des paramètres)
+        output_files = {}
+        async for result in await crawler.arun_many(urls, config=config, dispatcher=dispatcher):
+            if not result.success:
+                logger.error(f"Erreur lors du crawling de {result.url}: {result.error_message}")
+                continue
+            
+            key = _canonicalize_url(result.url)
+            page = self._result_to_page(result, crawled_at)
+            fingerprint = _content_fingerprint(page["content"])
+            unchanged = self._unchanged_output(result.url, fingerprint)
+            if unchanged:
+                output_files[key] = unchanged
+                continue
+            
+            output_file = self._output_path(result.url, output_format)
+            try:
+                await self._awrite_output(output_file, [page], output_format)
+                self._remember(result.url, fingerprint, output_file)
+                output_files[key] = output_file
+            except Exception as e:
+                logger.error(f"Exception lors de l'écriture de {output_file}: {e}")
+        
+        self.save_seen()
+        logger.info(f"Crawling terminé: {len(output_files)}/{len(urls)} URLs enregistrées")
+        return [output_files.get(_canonicalize_url(url), "") for url in urls]
+    
+    async def _crawl_bounded(self, url: str, semaphore: asyncio.Semaphore, crawler: Any,
+                             depth: int, output_format: str, crawled_at: str) -> str:
+        """Crawle une URL en respectant la limite de concurrence du lot."""
+        async with semaphore:
+            return await self.crawl_url(url, depth, output_format, crawler=crawler, crawled_at=crawled_at)
+    
+    async def fast_bulk_fetch(self, urls: List[str], output_format: str = "jsonl",
+                              max_connections: int = 64, max_keepalive: int = 8,
+                              timeout: float = 30.0) -> List[str]:
+        """
+        Récupère en parallèle des pages statiques (sans rendu JavaScript).
+        
+        Le HTML est téléchargé via un pool de connexions httpx partagé, puis
+        converti en markdown par crawl4ai à partir du HTML brut (préfixe "raw:"),
+        sans lancer de navigation. Les URLs dont le téléchargement échoue
+        repassent par le crawl navigateur classique.
+        
+        Args:
+            urls: URLs statiques à récupérer
+            output_format: Format de sortie (jsonl, json, md, txt)
+            max_connections: Nombre maximal de connexions simultanées
+            max_keepalive: Nombre de connexions gardées ouvertes entre requêtes
+            timeout: Délai maximal par requête, en secondes
+            
+        Returns:
+            Chemins des fichiers de sortie, dans l'ordre des URLs ("" en cas d'échec)
+        """
+        if not urls or not await self._aensure_installed():
+            return []
+        
+        import httpx
+        from crawl4ai import AsyncWebCrawler
+        
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        async with httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True) as client:
+            responses = await asyncio.gather(
+                *[client.get(url, headers=self._conditional_headers(url)) for url in urls],
+                return_exceptions=True
+            )
+        
+        crawled_at = datetime.now().isoformat()
+        output_files = {}
+        fallback_urls = []
+        
+        async with AsyncWebCrawler(verbose=False) as crawler:
+            config = self._run_config()
+            for url, response in zip(urls, responses):
+                if not isinstance(response, Exception) and response.status_code == 304:
+                    # Page inchangée côté serveur : le fichier existant reste valable
+                    output_files[url] = self.seen[_canonicalize_url(url)]["output_file"]
+                    continue
+                
+                if isinstance(response, Exception) or not response.is_success:
+                    reason = response if isinstance(response, Exception) else f"HTTP {response.status_code}"
+                    logger.warning(f"Téléchargement direct impossible pour {url} ({reason}), repli sur crawl4ai")
+                    fallback_urls.append(url)
+                    continue
+                
+                output_file = self._output_path(url, output_format)
+                try:
+                    result = await crawler.arun(url=f"raw:{response.text}", config=config)
+                    if not result.success:
+                        raise RuntimeError(result.error_message)
+                    page = self._result_to_page(result, crawled_at, url=url)
+                    
+                    # Empreinte du markdown rendu, comme _stream_many
+                    fingerprint = _content_fingerprint(page["content"])
+                    unchanged = self._unchanged_output(url, fingerprint)
+                    if unchanged:
+                        output_files[url] = unchanged
+                        self._remember(url, fingerprint, unchanged, response.headers)
+                        continue
+                    
+                    await self._awrite_output(output_file, [page], output_format)
+                    self._remember(url, fingerprint, output_file, response.headers)
+                    output_files[url] = output_file
+                except Exception as e:
+                    logger.warning(f"Extraction impossible pour {url} ({e}), repli sur crawl4ai")
+                    fallback_urls.append(url)
+        
+        if fallback_urls:
+            output_files.update(zip(fallback_urls, await self.crawl_many(fallback_urls, output_format=output_format)))
+        self.save_seen()
+        
+        logger.info(f"Récupération statique terminée: {sum(1 for f in output_files.values() if f)}/{len(urls)} URLs enregistrées")
+        return [output_files.get(url, "") for url in urls]
+    
+    async def crawl_multiple_urls(self, base_url: str, paths: List[str], depth: int = 1,
+                                  static: bool = False) -> List[str]:
+        """
+        Crawle plusieurs chemins d'un site web en parallèle.
         
         Args:
             base_url: URL de base du site
             paths: Liste des chemins relatifs à crawler
             depth: Profondeur du crawling
+            static: Pages statiques sans JavaScript : téléchargement direct via fast_bulk_fetch
             
         Returns:
             Liste des chemins des fichiers de sortie
         """
-        output_files = []
+        urls = []
         
         for path in paths:
             # Construire l'URL complète
@@ -130,13 +669,36 @@ class Crawl4AIManager:
                 if not path.startswith("/"):
                     path = f"/{path}"
                 url = f"{base_url.rstrip('/')}{path}"
-            
-            # Crawler l'URL
-            output_file = self.crawl_url(url, depth)
-            if output_file:
-                output_files.append(output_file)
+            urls.append(url)
+        
+        # Dédupliquer les doublons et alias (slash final, casse de l'hôte, fragment...)
+        unique_urls = {}
+        for url in urls:
+            unique_urls.setdefault(_canonicalize_url(url), url)
+        urls = list(unique_urls.values())
+        
+        # Crawler les URLs en parallèle
+        if static and depth <= 1:
+            output_files = await self.fast_bulk_fetch(urls)
+        else:
+            output_files = await self.crawl_many(urls, depth)
+        return [output_file for output_file in output_files if output_file]
+    
+    def crawl_multiple_urls_sync(self, base_url: str, paths: List[str], depth: int = 1,
+                                 static: bool = False) -> List[str]:
+        """
+        Variante synchrone de crawl_multiple_urls pour les appelants hors boucle asyncio.
         
-        return output_files
+        Args:
+            base_url: URL de base du site
+            paths: Liste des chemins relatifs à crawler
+            depth: Profondeur du crawling
+            static: Pages statiques sans JavaScript : téléchargement direct via fast_bulk_fetch
+            
+        Returns:
+            Liste des chemins des fichiers de sortie
+        """
+        return asyncio.run(self.crawl_multiple_urls(base_url, paths, depth, static))
     
     def process_crawled_data(self, file_path: str) -> List[Dict[str, Any]]:
         """
@@ -148,65 +710,166 @@ class Crawl4AIManager:
         Returns:
             Liste de documents formatés pour l'ingestion
         """
-        if not os.path.exists(file_path):
-            logger.error(f"Le fichier {file_path} n'existe pas")
+        try:
+            documents = list(self.iter_crawled_documents(file_path))
+            logger.info(f"Traité {len(documents)} documents depuis {file_path}")
+            return documents
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement de {file_path}: {e}")
             return []
+    
+    def iter_crawled_documents(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Produit les documents crawlés un par un, sans charger tout le fichier.
         
-        documents = []
+        Les fichiers JSONL sont lus ligne par ligne et les fichiers JSON sont
+        parsés de façon incrémentale avec ijson : l'embedding
+        en aval peut commencer avant la fin de la lecture du fichier.
         
-        try:
-            # Déterminer le format du fichier
-            _, ext = os.path.splitext(file_path)
+        Args:
+            file_path: Chemin du fichier de données crawlées
             
-            if ext == ".json":
-                # Charger les données JSON
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                # Traiter les données selon la structure de crawl4ai
-                if isinstance(data, list):
-                    for item in data:
-                        if "content" in item and "url" in item:
-                            documents.append({
-                                "text": item["content"],
-                                "metadata": {
-                                    "source": item["url"],
-                                    "title": item.get("title", ""),
-                                    "type": "crawled",
-                                    "timestamp": item.get("timestamp", "")
-                                }
-                            })
-                elif isinstance(data, dict):
-                    if "pages" in data:
-                        for page in data["pages"]:
-                            if "content" in page and "url" in page:
-                                documents.append({
-                                    "text": page["content"],
-                                    "metadata": {
-                                        "source": page["url"],
-                                        "title": page.get("title", ""),
-                                        "type": "crawled",
-                                        "timestamp": page.get("timestamp", "")
-                                    }
-                                })
-            elif ext == ".md" or ext == ".txt":
-                # Charger le contenu du fichier texte
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
+        Yields:
+            Documents formatés pour l'ingestion
+            
+        Raises:
+            Exception: En cas d'erreur de lecture ou de parsing
+        """
+        if not os.path.exists(file_path):
+            logger.error(f"Le fichier {file_path} n'existe pas")
+            return
+        
+        # Déterminer le format du fichier
+        _, ext = os.path.splitext(file_path)
+        
+        if ext == ".jsonl":
+            # JSON délimité par lignes : une page par ligne
+            with open(file_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    page = json_loads(line)
+                    if isinstance(page, dict) and "content" in page and "url" in page:
+                        yield self._to_document(page)
+        elif ext == ".json":
+            with open(file_path, "rb") as f:
+                # Structure de crawl4ai : liste de pages ou objet {"pages": [...]}
+                first_char = f.read(1)
+                while first_char.isspace():
+                    first_char = f.read(1)
+                f.seek(0)
+                prefix = "item" if first_char == b"[" else "pages.item"
                 
-                # Créer un document unique
-                documents.append({
-                    "text": content,
-                    "metadata": {
-                        "source": file_path,
-                        "title": os.path.basename(file_path),
-                        "type": "crawled",
-                        "timestamp": str(os.path.getmtime(file_path))
-                    }
-                })
+                for page in ijson.items(f, prefix, use_float=True):
+                    if isinstance(page, dict) and "content" in page and "url" in page:
+                        yield self._to_document(page)
+        elif ext == ".md" or ext == ".txt":
+            # Charger le contenu du fichier texte
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
             
+            # Créer un document unique
+            yield {
+                "text": content,
+                "metadata": {
+                    "source": file_path,
+                    "title": os.path.basename(file_path),
+                    "type": "crawled",
+                    "timestamp": str(os.path.getmtime(file_path))
+                }
+            }
+    
+    async def aprocess_crawled_data(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Variante asynchrone de process_crawled_data, sans bloquer la boucle asyncio.
+        
+        Args:
+            file_path: Chemin du fichier de données crawlées
+            
+        Returns:
+            Liste de documents formatés pour l'ingestion
+        """
+        try:
+            documents = [document async for document in self.aiter_crawled_documents(file_path)]
             logger.info(f"Traité {len(documents)} documents depuis {file_path}")
             return documents
         except Exception as e:
             logger.error(f"Erreur lors du traitement de {file_path}: {e}")
             return []
+    
+    async def aiter_crawled_documents(self, file_path: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Variante asynchrone de iter_crawled_documents.
+        
+        Les lectures passent par aiofiles et le JSON est parsé de façon
+        incrémentale avec ijson.items_async : la boucle asyncio reste libre
+        pendant la lecture de gros fichiers.
+        
+        Args:
+            file_path: Chemin du fichier de données crawlées
+            
+        Yields:
+            Documents formatés pour l'ingestion
+        """
+        import aiofiles
+        
+        if not os.path.exists(file_path):
+            logger.error(f"Le fichier {file_path} n'existe pas")
+            return
+        
+        _, ext = os.path.splitext(file_path)
+        
+        if ext == ".jsonl":
+            async with aiofiles.open(file_path, "rb") as f:
+                async for line in f:
+                    if not line.strip():
+                        continue
+                    page = json_loads(line)
+                    if isinstance(page, dict) and "content" in page and "url" in page:
+                        yield self._to_document(page)
+        elif ext == ".json":
+            async with aiofiles.open(file_path, "rb") as f:
+                first_char = await f.read(1)
+                while first_char.isspace():
+                    first_char = await f.read(1)
+                await f.seek(0)
+                prefix = "item" if first_char == b"[" else "pages.item"
+                
+                async for page in ijson.items_async(f, prefix, use_float=True):
+                    if isinstance(page, dict) and "content" in page and "url" in page:
+                        yield self._to_document(page)
+        elif ext == ".md" or ext == ".txt":
+            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+                content = await f.read()
+            
+            yield {
+                "text": content,
+                "metadata": {
+                    "source": file_path,
+                    "title": os.path.basename(file_path),
+                    "type": "crawled",
+                    "timestamp": str(os.path.getmtime(file_path))
+                }
+            }
+    
+    def _to_document(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convertit une page crawlée en document d'ingestion.
+        
+        Args:
+            page: Page crawlée (url, content, title, timestamp)
+            
+        Returns:
+            Document formaté pour l'ingestion
+        """
+        content, url = _page_content_and_url(page)
+        get = page.get
+        return {
+            "text": content,
+            "metadata": {
+                "source": url,
+                "title": get("title", ""),
+                "type": "crawled",
+                "timestamp": get("timestamp", "")
+            }
+        }
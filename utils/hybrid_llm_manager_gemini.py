@@ -1,9 +1,216 @@
 # utils/hybrid_llm_manager_gemini.py
 import os
-import json
 import time
-from typing import Dict, Any, Optional
+import atexit
+import asyncio
+import threading
+import weakref
+import hashlib
+import importlib.util
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterator
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+from utils.json_utils import json_dumps, json_loads
+
+@lru_cache(maxsize=None)
+def _probe_groq(api_key: Optional[str]) -> bool:
+    """Vérifie une seule fois par clé que Groq est configuré (clé + SDK installé, sans l'importer)"""
+    if not api_key:
+        print("⚠️ Groq non disponible: GROQ_API_KEY absente")
+        return False
+    if importlib.util.find_spec("groq") is None:
+        print("⚠️ Groq non disponible: No module named 'groq'")
+        return False
+    return True
+
+@lru_cache(maxsize=1)
+def _get_token_encoder():
+    """Encodeur tiktoken (BPE en Rust) chargé une seule fois, None si indisponible"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+def count_tokens(text: Optional[str]) -> int:
+    """Compte les tokens d'un texte (tiktoken si disponible, sinon découpage sur les espaces)"""
+    if not text:
+        return 0
+    encoder = _get_token_encoder()
+    if encoder is None:
+        return len(text.split())
+    return len(encoder.encode(text, disallowed_special=()))
+
+@lru_cache(maxsize=32)
+def _system_prompt_tokens(system_prompt: str) -> int:
+    """Tokens d'un prompt système, comptés une seule fois (il est identique d'un tour à l'autre)"""
+    return count_tokens(system_prompt)
+
+@lru_cache(maxsize=32)
+def _prompt_prefix(system_prompt: str) -> str:
+    """Préfixe Gemini rendu une seule fois par prompt système"""
+    return f"{system_prompt}\n\nQuestion: "
+
+@lru_cache(maxsize=32)
+def _system_message(system_prompt: str) -> Dict[str, str]:
+    """Message système Groq partagé par prompt système (ne pas modifier)"""
+    return {"role": "system", "content": system_prompt}
+
+def _build_prompt(prompt: str, system_prompt: Optional[str]) -> str:
+    """Prompt complet Gemini : une seule concaténation par appel"""
+    return _prompt_prefix(system_prompt) + prompt if system_prompt else prompt
+
+def _build_messages(prompt: str, system_prompt: Optional[str]) -> list:
+    """Messages Groq : le message système est réutilisé d'un appel à l'autre"""
+    user_message = {"role": "user", "content": prompt}
+    return [_system_message(system_prompt), user_message] if system_prompt else [user_message]
+
+# Préfixes des messages d'erreur renvoyés à la place d'une réponse (jamais mis en cache)
+_ERROR_PREFIXES = ("Erreur", "❌", "Limite de taux", "Désolé, j'ai rencontré")
+
+# Mots-clés des erreurs de quota / d'authentification renvoyées par Gemini
+_RATE_LIMIT_KEYWORDS = ("quota", "429", "rate limit", "resource_exhausted")
+_AUTH_ERROR_KEYWORDS = ("401", "invalid", "unauthorized", "api_key")
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Indique si une erreur provient d'une limite de débit ou de quota"""
+    error_str = str(error).lower()
+    return any(keyword in error_str for keyword in _RATE_LIMIT_KEYWORDS)
+
+class _TokenBucket:
+    """Seau à jetons en mémoire : autorise `rate` requêtes par `period` secondes, avec rafales"""
+    
+    def __init__(self, rate: int, period: float = 60.0):
+        self.capacity = float(rate)
+        self.refill_per_second = rate / period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Consomme des jetons s'il en reste, sans jamais bloquer"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+            self._updated = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+class _ResponseCache:
+    """Cache LRU à durée de vie limitée des réponses LLM, persistable sur disque"""
+    
+    def __init__(self, max_entries: int = 500, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()   # clé -> (expiration epoch, réponse)
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Renvoie la réponse en cache si elle n'a pas expiré"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key: str, response: str):
+        """Ajoute une réponse, en évinçant la moins récemment utilisée si nécessaire"""
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def load(self, path: str):
+        """Recharge les entrées encore valides depuis le disque"""
+        try:
+            with open(path, 'rb') as f:
+                stored = json_loads(f.read())
+        except Exception:
+            return
+        now = time.time()
+        with self._lock:
+            for key, (expires_at, response) in stored.items():
+                if expires_at > now:
+                    self._entries[key] = (expires_at, response)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def save(self, path: str):
+        """Écrit les entrées encore valides sur disque"""
+        now = time.time()
+        with self._lock:
+            stored = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(json_dumps(stored))
+        except Exception as e:
+            print(f"⚠️ Cache de réponses non sauvegardé: {e}")
+
+class _SemanticCache:
+    """Cache sémantique : réutilise la réponse d'un prompt proche (similarité cosinus des embeddings)"""
+    
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", threshold: float = 0.95,
+                 max_entries: int = 500, ttl: float = 3600.0):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._encoder = None
+        self._vectors = None            # Matrice (N, d) d'embeddings normalisés
+        self._entries = []              # (portée, expiration epoch, réponse), alignées sur _vectors
+        self._lock = threading.Lock()
+    
+    def encode(self, text: str):
+        """Embedding normalisé d'un prompt (modèle chargé au premier appel)"""
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+            self._encoder = SentenceTransformer(self.model_name, device="cpu")
+        return self._encoder.encode([text], normalize_embeddings=True, convert_to_numpy=True)[0].astype("float32")
+    
+    def lookup(self, scope: str, vector) -> Optional[str]:
+        """Réponse du prompt le plus proche dans la même portée (prompt système), si assez similaire"""
+        import numpy as np
+        
+        with self._lock:
+            if not self._entries:
+                return None
+            # Produit scalaire = similarité cosinus (vecteurs normalisés)
+            similarities = self._vectors @ vector
+            now = time.time()
+            for index in np.argsort(-similarities):
+                if similarities[index] < self.threshold:
+                    return None
+                entry_scope, expires_at, response = self._entries[index]
+                if entry_scope == scope and expires_at > now:
+                    return response
+        return None
+    
+    def add(self, scope: str, vector, response: str):
+        """Ajoute une réponse (les plus anciennes sont évincées au-delà de max_entries)"""
+        import numpy as np
+        
+        with self._lock:
+            row = vector[np.newaxis, :]
+            self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+            self._entries.append((scope, time.time() + self.ttl, response))
+            if len(self._entries) > self.max_entries:
+                overflow = len(self._entries) - self.max_entries
+                self._vectors = self._vectors[overflow:]
+                del self._entries[:overflow]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 class HybridLLMManagerGemini:
     """Gestionnaire LLM hybride : Google Gemini -> Groq/Llama 3"""
@@ -20,9 +227,84 @@ class HybridLLMManagerGemini:
         self.token_limit_per_hour = 15000   # Limite tokens/heure
         self.token_limit_per_day = 100000   # Limite tokens/jour
         
-        # Tracking des tokens
+        # Tracking des tokens (en mémoire, écrit sur disque par lots)
         self.token_usage_file = "config/token_usage_gemini.json"
         self.load_token_usage()
+        self._window_end = 0.0          # Fin (epoch) de l'heure courante : 0 force le premier calcul
+        self._limit_reason: Optional[str] = None   # Dépassement de limite mémorisé (None = dans les limites)
+        self.flush_every = 20           # Écriture après N mises à jour...
+        self.flush_interval = 10.0      # ...ou après N secondes
+        self._pending_updates = 0
+        self._last_flush = time.monotonic()
+        self._save_lock = threading.Lock()
+        atexit.register(self.flush_token_usage)
+        
+        # Débit Gemini (requêtes/minute) : au-delà, la requête part directement vers Groq
+        self.gemini_rpm = int(os.getenv("GEMINI_RPM", "15"))
+        self._gemini_bucket = _TokenBucket(self.gemini_rpm) if self.gemini_rpm > 0 else None
+        
+        # Backoff exponentiel sur 429 avant de basculer, puis pause temporaire de Gemini
+        self.gemini_max_retries = 3
+        self.gemini_backoff_initial = 30.0   # secondes
+        self.gemini_backoff_factor = 1.5
+        self.gemini_cooldown = 60.0          # secondes
+        self._gemini_cooldown_until: Optional[float] = None
+        
+        # Température d'échantillonnage et longueur maximale de réponse communes aux providers
+        self.temperature = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+        self.max_output_tokens = 1024
+        
+        # Cache des réponses : actif par défaut uniquement en génération déterministe
+        cache_setting = os.getenv("LLM_RESPONSE_CACHE")
+        if cache_setting is None:
+            self.cache_responses = self.temperature == 0
+        else:
+            self.cache_responses = cache_setting.lower() in ("1", "true", "yes")
+        self.response_cache_file = "config/llm_response_cache.json"
+        self.response_cache = _ResponseCache(max_entries=500, ttl=3600.0)
+        if self.cache_responses:
+            self.response_cache.load(self.response_cache_file)
+            atexit.register(self.response_cache.save, self.response_cache_file)
+        
+        # Cache sémantique optionnel (paraphrases), en complément du cache exact
+        self.semantic_cache: Optional[_SemanticCache] = None
+        if self.cache_responses and os.getenv("LLM_SEMANTIC_CACHE", "false").lower() in ("1", "true", "yes"):
+            self.semantic_cache = _SemanticCache(
+                model_name=os.getenv("LLM_SEMANTIC_CACHE_MODEL", "all-MiniLM-L6-v2"),
+                threshold=float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+            )
+        
+        # Génération spéculative (Gemini et Groq en parallèle) : double le coût, désactivée par défaut
+        self.speculative = os.getenv("LLM_SPECULATIVE", "false").lower() in ("1", "true", "yes")
+        
+        # Tokens consommés côté Groq (hors quotas Gemini)
+        self.groq_tokens_used = 0
+        
+        # Pool de threads partagé (générations soumises, écritures disque, embeddings)
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm")
+        
+        # Appels simultanés par provider (le débit par minute reste régulé par _gemini_bucket)
+        self.gemini_max_concurrency = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+        self.groq_max_concurrency = int(os.getenv("GROQ_MAX_CONCURRENCY", "2"))
+        self._gemini_slots = threading.BoundedSemaphore(self.gemini_max_concurrency)
+        self._groq_slots = threading.BoundedSemaphore(self.groq_max_concurrency)
+        # Équivalents asyncio, créés à la demande pour chaque boucle d'événements
+        self._async_slots = weakref.WeakKeyDictionary()
+        
+        # Pool HTTP des clients Groq
+        self.groq_max_connections = 20
+        self.groq_max_keepalive = 10
+        
+        # Clients Gemini et Groq (créés à la première utilisation)
+        self._gemini_client = None
+        self._gemini_generation_config = None
+        
+        # Cache de contexte Gemini : le prompt système est conservé côté serveur (opt-in)
+        self.gemini_context_cache = os.getenv("GEMINI_CONTEXT_CACHE", "false").lower() in ("1", "true", "yes")
+        self.gemini_context_cache_ttl = timedelta(hours=1)
+        self._gemini_cached_models: Dict[str, tuple] = {}   # prompt système -> (modèle ou None, expiration)
+        self._groq_client = None
+        self._async_groq_client = None
         
         # État du système
         self.gemini_available = bool(self.google_api_key)
@@ -35,22 +317,15 @@ class HybridLLMManagerGemini:
         print(f"   🎯 Provider actuel: {self.current_provider}")
     
     def _check_groq(self) -> bool:
-        """Vérifie la disponibilité de Groq"""
-        try:
-            from groq import Groq
-            # Tester la connexion
-            client = Groq(api_key=self.groq_api_key)
-            return True
-        except Exception as e:
-            print(f"⚠️ Groq non disponible: {e}")
-            return False
+        """Vérifie la configuration Groq sans appel réseau ; le client est validé au premier appel réel"""
+        return _probe_groq(self.groq_api_key)
     
     def load_token_usage(self):
         """Charge l'utilisation des tokens"""
         try:
             if os.path.exists(self.token_usage_file):
-                with open(self.token_usage_file, 'r') as f:
-                    self.token_usage = json.load(f)
+                with open(self.token_usage_file, 'rb') as f:
+                    self.token_usage = json_loads(f.read())
             else:
                 self.token_usage = {
                     "daily": {"date": "", "tokens": 0},
@@ -64,18 +339,43 @@ class HybridLLMManagerGemini:
     
     def save_token_usage(self):
         """Sauvegarde l'utilisation des tokens"""
+        self._write_token_usage(json_dumps(self.token_usage, indent=True))
+    
+    def _write_token_usage(self, payload: bytes):
+        """Écrit un instantané déjà sérialisé de l'utilisation des tokens"""
         try:
-            os.makedirs(os.path.dirname(self.token_usage_file), exist_ok=True)
-            with open(self.token_usage_file, 'w') as f:
-                json.dump(self.token_usage, f, indent=2)
+            with self._save_lock:
+                os.makedirs(os.path.dirname(self.token_usage_file), exist_ok=True)
+                # Fichier temporaire puis os.replace : jamais de fichier tronqué en cas de crash
+                temp_file = f"{self.token_usage_file}.tmp"
+                with open(temp_file, 'wb') as f:
+                    f.write(payload)
+                os.replace(temp_file, self.token_usage_file)
         except:
             pass
     
-    def update_token_usage(self, tokens: int):
-        """Met à jour le compteur de tokens"""
-        now = datetime.now()
-        today = now.strftime("%Y-%m-%d")
-        current_hour = now.strftime("%Y-%m-%d-%H")
+    def flush_token_usage(self):
+        """Écrit l'utilisation des tokens si des mises à jour sont en attente"""
+        if self._pending_updates:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            
+            if loop is not None:
+                # Depuis la boucle asyncio : l'écriture part dans un thread, l'appel rend la main aussitôt
+                payload = json_dumps(self.token_usage, indent=True)
+                loop.run_in_executor(self._executor, self._write_token_usage, payload)
+            else:
+                self.save_token_usage()
+            self._pending_updates = 0
+        self._last_flush = time.monotonic()
+    
+    def _roll_token_windows(self, now: float):
+        """Réinitialise les compteurs heure/jour au changement de fenêtre et calcule la fin de l'heure"""
+        current = datetime.fromtimestamp(now)
+        today = current.strftime("%Y-%m-%d")
+        current_hour = current.strftime("%Y-%m-%d-%H")
         
         # Reset daily counter if new day
         if self.token_usage["daily"]["date"] != today:
@@ -85,27 +385,153 @@ class HybridLLMManagerGemini:
         if self.token_usage["hourly"]["hour"] != current_hour:
             self.token_usage["hourly"] = {"hour": current_hour, "tokens": 0}
         
+        # Un changement de jour est aussi un changement d'heure : une seule échéance suffit
+        hour_start = current.replace(minute=0, second=0, microsecond=0)
+        self._window_end = (hour_start + timedelta(hours=1)).timestamp()
+    
+    def update_token_usage(self, tokens: int):
+        """Met à jour le compteur de tokens"""
+        # Comparaison d'un flottant : les dates ne sont formatées qu'au changement d'heure
+        now = time.time()
+        if now >= self._window_end:
+            self._roll_token_windows(now)
+        
         # Add tokens
         self.token_usage["daily"]["tokens"] += tokens
         self.token_usage["hourly"]["tokens"] += tokens
+        self._refresh_token_limits()
         
-        self.save_token_usage()
+        # Écriture différée : pas d'I/O disque à chaque appel
+        self._pending_updates += 1
+        if (self._pending_updates >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush_token_usage()
         
         # Log usage
         print(f"📊 Tokens utilisés: +{tokens} (Total jour: {self.token_usage['daily']['tokens']}, Heure: {self.token_usage['hourly']['tokens']})")
     
-    def should_use_gemini(self) -> bool:
-        """Détermine si on peut utiliser Gemini"""
+    def _estimate_tokens(self, prompt: str, response_text: str, system_prompt: Optional[str] = None) -> int:
+        """Estime les tokens consommés par un échange"""
+        return count_tokens(prompt) + count_tokens(response_text) + _system_prompt_tokens(system_prompt or "")
+    
+    def _gemini_tokens(self, response, prompt: str, system_prompt: Optional[str] = None) -> int:
+        """Tokens facturés par Gemini (usage_metadata), hors contenu en cache ; estimation à défaut"""
+        usage = getattr(response, "usage_metadata", None)
+        total = getattr(usage, "total_token_count", 0) or 0
+        if not total:
+            return self._estimate_tokens(prompt, response.text, system_prompt)
+        cached = getattr(usage, "cached_content_token_count", 0) or 0
+        return total - cached
+    
+    def _record_groq_usage(self, completion) -> int:
+        """Comptabilise les tokens exacts renvoyés par Groq (completion.usage)"""
+        tokens = getattr(getattr(completion, "usage", None), "total_tokens", 0) or 0
+        self.groq_tokens_used += tokens
+        return tokens
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Délai avant la tentative suivante (croissance exponentielle)"""
+        return self.gemini_backoff_initial * (self.gemini_backoff_factor ** attempt)
+    
+    def _provider_slots(self, provider: str) -> asyncio.Semaphore:
+        """Sémaphore asyncio limitant les appels simultanés d'un provider dans la boucle courante"""
+        loop = asyncio.get_running_loop()
+        slots = self._async_slots.get(loop)
+        if slots is None:
+            slots = {
+                "gemini": asyncio.Semaphore(self.gemini_max_concurrency),
+                "groq": asyncio.Semaphore(self.groq_max_concurrency),
+            }
+            self._async_slots[loop] = slots
+        return slots[provider]
+    
+    def _call_gemini_with_backoff(self, call, acquire_slot: bool = True):
+        """Exécute un appel Gemini en réessayant avec backoff exponentiel sur limite de débit
+        
+        acquire_slot=False lorsque l'appelant occupe déjà un créneau (lecture d'un flux)
+        """
+        for attempt in range(self.gemini_max_retries):
+            try:
+                if not acquire_slot:
+                    return call()
+                # Le créneau n'est occupé que pendant l'appel, pas pendant l'attente du backoff
+                with self._gemini_slots:
+                    return call()
+            except Exception as e:
+                if not _is_rate_limit_error(e) or attempt == self.gemini_max_retries - 1:
+                    raise
+                delay = self._backoff_delay(attempt)
+                print(f"⏳ Limite de débit Gemini, nouvelle tentative dans {delay:.0f}s ({attempt + 1}/{self.gemini_max_retries})")
+                time.sleep(delay)
+    
+    async def _acall_gemini_with_backoff(self, call):
+        """Variante asynchrone de _call_gemini_with_backoff (call renvoie une coroutine)"""
+        for attempt in range(self.gemini_max_retries):
+            try:
+                async with self._provider_slots("gemini"):
+                    return await call()
+            except Exception as e:
+                if not _is_rate_limit_error(e) or attempt == self.gemini_max_retries - 1:
+                    raise
+                delay = self._backoff_delay(attempt)
+                print(f"⏳ Limite de débit Gemini, nouvelle tentative dans {delay:.0f}s ({attempt + 1}/{self.gemini_max_retries})")
+                await asyncio.sleep(delay)
+    
+    def _start_gemini_cooldown(self):
+        """Met Gemini en pause temporaire après épuisement des tentatives"""
+        self.gemini_available = False
+        self._gemini_cooldown_until = time.monotonic() + self.gemini_cooldown
+    
+    def _refresh_token_limits(self):
+        """Recalcule le verdict des limites de tokens, mémorisé jusqu'au prochain changement des compteurs"""
+        if self.token_usage["hourly"]["tokens"] >= self.token_limit_per_hour:
+            reason = f"⚠️ Limite horaire atteinte ({self.token_usage['hourly']['tokens']}/{self.token_limit_per_hour})"
+        elif self.token_usage["daily"]["tokens"] >= self.token_limit_per_day:
+            reason = f"⚠️ Limite quotidienne atteinte ({self.token_usage['daily']['tokens']}/{self.token_limit_per_day})"
+        else:
+            reason = None
+        
+        # Signalé une seule fois, au passage de la limite
+        if reason is not None and self._limit_reason is None:
+            print(reason)
+        self._limit_reason = reason
+    
+    def _projected_tokens(self, prompt: str, system_prompt: Optional[str] = None) -> int:
+        """Coût maximal prévisible d'une requête : prompt + réponse la plus longue autorisée"""
+        return count_tokens(prompt) + _system_prompt_tokens(system_prompt or "") + self.max_output_tokens
+    
+    def should_use_gemini(self, projected_tokens: int = 0) -> bool:
+        """Détermine si on peut utiliser Gemini
+        
+        projected_tokens : coût prévu de la requête, refusée d'emblée si elle dépasserait
+        le budget horaire ou quotidien restant
+        """
         if not self.gemini_available:
+            # Réactivation automatique à la fin d'une pause liée au quota
+            if self._gemini_cooldown_until is None or time.monotonic() < self._gemini_cooldown_until:
+                return False
+            self._gemini_cooldown_until = None
+            self.gemini_available = True
+            print("🔄 Fin de la pause Gemini, réactivation")
+        
+        # Vérifier les limites de tokens : verdict mémorisé, recalculé au changement d'heure
+        now = time.time()
+        if now >= self._window_end:
+            self._roll_token_windows(now)
+            self._refresh_token_limits()
+        if self._limit_reason is not None:
             return False
         
-        # Vérifier les limites de tokens
-        if self.token_usage["hourly"]["tokens"] >= self.token_limit_per_hour:
-            print(f"⚠️ Limite horaire atteinte ({self.token_usage['hourly']['tokens']}/{self.token_limit_per_hour})")
+        # Admission préalable : ne pas lancer une requête qui ferait dépasser le budget
+        if projected_tokens and (
+                self.token_usage["hourly"]["tokens"] + projected_tokens > self.token_limit_per_hour
+                or self.token_usage["daily"]["tokens"] + projected_tokens > self.token_limit_per_day):
+            print(f"⚠️ Budget Gemini insuffisant pour cette requête (~{projected_tokens} tokens)")
             return False
         
-        if self.token_usage["daily"]["tokens"] >= self.token_limit_per_day:
-            print(f"⚠️ Limite quotidienne atteinte ({self.token_usage['daily']['tokens']}/{self.token_limit_per_day})")
+        # Limite de requêtes par minute : éviter un 429 certain (et son backoff)
+        if self._gemini_bucket is not None and not self._gemini_bucket.try_acquire():
+            print(f"⚠️ Débit Gemini atteint ({self.gemini_rpm} requêtes/min)")
             return False
         
         return True
@@ -113,36 +539,18 @@ class HybridLLMManagerGemini:
     def generate_with_gemini(self, prompt: str, system_prompt: str = None) -> str:
         """Génère avec Google Gemini"""
         try:
-            import google.generativeai as genai
-            
-            # Configuration Gemini
-            genai.configure(api_key=self.google_api_key)
-            model = genai.GenerativeModel(self.gemini_model)
-            
-            # Construire le prompt complet
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\nQuestion: {prompt}"
-            else:
-                full_prompt = prompt
+            # Modèle et configuration Gemini partagés (configurés au premier appel)
+            model, generation_config, full_prompt = self._gemini_request(prompt, system_prompt)
             
             print("🔄 Génération avec Google Gemini...")
             
-            # Configuration de génération
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.7,
-                max_output_tokens=1024,
-                top_p=0.9,
-            )
-            
-            response = model.generate_content(
-                full_prompt,
-                generation_config=generation_config
+            response = self._call_gemini_with_backoff(
+                lambda: model.generate_content(full_prompt, generation_config=generation_config)
             )
             
             if response.text:
-                # Estimer les tokens utilisés
-                estimated_tokens = len(prompt.split()) + len(response.text.split()) + (len(system_prompt.split()) if system_prompt else 0)
-                self.update_token_usage(estimated_tokens)
+                # Tokens réellement facturés par Gemini
+                self.update_token_usage(self._gemini_tokens(response, prompt, system_prompt))
                 
                 print(f"✅ Réponse Gemini générée ({len(response.text)} chars)")
                 return response.text
@@ -153,12 +561,12 @@ class HybridLLMManagerGemini:
             error_str = str(e).lower()
             print(f"❌ Erreur Gemini: {e}")
             
-            # Vérifier si c'est un problème de quota
-            if any(keyword in error_str for keyword in ["quota", "429", "rate limit", "resource_exhausted"]):
-                print("🔄 Quota Gemini épuisé, basculement vers Groq/Llama 3")
-                self.gemini_available = False
+            # Vérifier si c'est un problème de quota (persistant malgré le backoff)
+            if _is_rate_limit_error(e):
+                print(f"🔄 Quota Gemini épuisé, basculement vers Groq/Llama 3 pendant {self.gemini_cooldown:.0f}s")
+                self._start_gemini_cooldown()
                 return self.generate_with_groq(prompt, system_prompt)
-            elif any(keyword in error_str for keyword in ["401", "invalid", "unauthorized", "api_key"]):
+            elif any(keyword in error_str for keyword in _AUTH_ERROR_KEYWORDS):
                 print("🔄 Clé Gemini invalide, basculement vers Groq/Llama 3")
                 self.gemini_available = False
                 return self.generate_with_groq(prompt, system_prompt)
@@ -169,39 +577,28 @@ class HybridLLMManagerGemini:
     def generate_with_groq(self, prompt: str, system_prompt: str = None) -> str:
         """Génère avec Groq/Llama 3"""
         try:
-            from groq import Groq
-            
-            # Initialiser le client Groq
-            client = Groq(api_key=self.groq_api_key)
+            # Client Groq partagé : connexions HTTP keep-alive réutilisées
+            client = self._get_groq_client()
             
             # Construire les messages
-            messages = []
-            
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
-            
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
+            messages = _build_messages(prompt, system_prompt)
             
             print("🦙 Génération avec Groq/Llama 3...")
             
             # Appel à l'API Groq
-            completion = client.chat.completions.create(
-                model=self.groq_model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1024,
-                top_p=0.9,
-                stream=False
-            )
+            with self._groq_slots:
+                completion = client.chat.completions.create(
+                    model=self.groq_model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_output_tokens,
+                    top_p=0.9,
+                    stream=False
+                )
             
             response_text = completion.choices[0].message.content
-            print(f"✅ Réponse Groq/Llama 3 générée ({len(response_text)} chars)")
+            tokens = self._record_groq_usage(completion)
+            print(f"✅ Réponse Groq/Llama 3 générée ({len(response_text)} chars, {tokens} tokens)")
             return response_text
                 
         except Exception as e:
@@ -216,11 +613,158 @@ class HybridLLMManagerGemini:
             else:
                 return f"Désolé, j'ai rencontré un problème technique. Erreur: {str(e)}"
     
+    def stream_with_gemini(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        """Génère avec Google Gemini en flux : les fragments sont renvoyés dès leur réception"""
+        model, generation_config, full_prompt = self._gemini_request(prompt, system_prompt)
+        
+        print("🔄 Génération en flux avec Google Gemini...")
+        
+        # Le créneau reste occupé tant que le flux est lu : la génération se poursuit côté serveur
+        with self._gemini_slots:
+            response = self._call_gemini_with_backoff(
+                lambda: model.generate_content(full_prompt, generation_config=generation_config, stream=True),
+                acquire_slot=False
+            )
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Fragment sans texte (métadonnées, filtre de sécurité)
+                    continue
+                if text:
+                    yield text
+        
+        self.update_token_usage(self._gemini_tokens(response, prompt, system_prompt))
+    
+    def stream_with_groq(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        """Génère avec Groq/Llama 3 en flux : les fragments sont renvoyés dès leur réception"""
+        client = self._get_groq_client()
+        
+        print("🦙 Génération en flux avec Groq/Llama 3...")
+        
+        # Le créneau reste occupé tant que le flux est lu
+        with self._groq_slots:
+            stream = client.chat.completions.create(
+                model=self.groq_model,
+                messages=_build_messages(prompt, system_prompt),
+                temperature=self.temperature,
+                max_tokens=self.max_output_tokens,
+                top_p=0.9,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                # Le dernier fragment Groq porte l'usage exact de l'échange
+                usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                if usage is not None:
+                    self.groq_tokens_used += getattr(usage, "total_tokens", 0) or 0
+    
+    def generate_stream(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        """Génère une réponse en flux avec le meilleur provider disponible"""
+        cached, cache_context = self._lookup_cache(prompt, system_prompt)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        
+        if self.should_use_gemini(self._projected_tokens(prompt, system_prompt)):
+            try:
+                self.current_provider = "gemini"
+                for text in self.stream_with_gemini(prompt, system_prompt):
+                    chunks.append(text)
+                    yield text
+            except Exception as e:
+                print(f"⚠️ Échec Gemini: {e}")
+                if chunks:
+                    # Réponse déjà partiellement envoyée : impossible de changer de provider
+                    return
+                if _is_rate_limit_error(e):
+                    self._start_gemini_cooldown()
+        
+        if not chunks:
+            if not self.groq_available:
+                yield "❌ Aucun LLM disponible. Vérifiez votre configuration Gemini ou votre clé API Groq."
+                return
+            
+            self.current_provider = "groq"
+            try:
+                for text in self.stream_with_groq(prompt, system_prompt):
+                    chunks.append(text)
+                    yield text
+            except Exception as e:
+                print(f"❌ Erreur Groq: {e}")
+                if not chunks:
+                    yield f"Désolé, j'ai rencontré un problème technique. Erreur: {str(e)}"
+                return
+        
+        self._cache_response(cache_context, "".join(chunks))
+    
+    def _cache_key(self, prompt: str, system_prompt: Optional[str]) -> str:
+        """Clé de cache SHA-256 (modèles + prompt système + prompt utilisateur)"""
+        raw = f"{self.gemini_model}\0{self.groq_model}\0{system_prompt or ''}\0{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def _lookup_cache(self, prompt: str, system_prompt: Optional[str]):
+        """Cherche une réponse en cache (exacte puis sémantique)
+        
+        Renvoie (réponse, None) sur un succès, (None, contexte d'insertion) sinon
+        """
+        if not self.cache_responses:
+            return None, None
+        
+        key = self._cache_key(prompt, system_prompt)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            print("⚡ Réponse servie depuis le cache")
+            return cached, None
+        
+        vector = None
+        if self.semantic_cache is not None:
+            try:
+                vector = self.semantic_cache.encode(prompt)
+                cached = self.semantic_cache.lookup(system_prompt or "", vector)
+            except Exception as e:
+                print(f"⚠️ Cache sémantique désactivé: {e}")
+                self.semantic_cache = None
+            if cached is not None:
+                print("⚡ Réponse servie depuis le cache sémantique")
+                return cached, None
+        
+        return None, (key, system_prompt or "", vector)
+    
+    def _cache_response(self, context, response: str):
+        """Met en cache une réponse valide (les messages d'erreur sont ignorés)"""
+        if context is None or not response or response.startswith(_ERROR_PREFIXES):
+            return
+        key, scope, vector = context
+        self.response_cache.set(key, response)
+        if self.semantic_cache is not None and vector is not None:
+            self.semantic_cache.add(scope, vector, response)
+    
     def generate(self, prompt: str, system_prompt: str = None) -> str:
+        """Génère une réponse avec le meilleur provider disponible (avec cache des réponses)"""
+        cached, cache_context = self._lookup_cache(prompt, system_prompt)
+        if cached is not None:
+            return cached
+        
+        response = self._generate_uncached(prompt, system_prompt)
+        self._cache_response(cache_context, response)
+        return response
+    
+    def submit(self, prompt: str, system_prompt: str = None) -> Future:
+        """Soumet generate au pool de threads partagé et renvoie un Future
+        
+        Les appelants concurrents réutilisent les mêmes threads au lieu d'en créer un par requête
+        """
+        return self._executor.submit(self.generate, prompt, system_prompt)
+    
+    def _generate_uncached(self, prompt: str, system_prompt: str = None) -> str:
         """Génère une réponse avec le meilleur provider disponible"""
         
         # Essayer Gemini en premier si disponible et dans les limites
-        if self.should_use_gemini():
+        if self.should_use_gemini(self._projected_tokens(prompt, system_prompt)):
             try:
                 self.current_provider = "gemini"
                 return self.generate_with_gemini(prompt, system_prompt)
@@ -234,9 +778,254 @@ class HybridLLMManagerGemini:
         else:
             return "❌ Aucun LLM disponible. Vérifiez votre configuration Gemini ou votre clé API Groq."
     
+    async def agenerate_with_gemini(self, prompt: str, system_prompt: str = None) -> str:
+        """Génère avec Google Gemini sans bloquer la boucle asyncio (bascule vers Groq en cas d'erreur)"""
+        try:
+            return await self._agenerate_gemini_raw(prompt, system_prompt)
+        except Exception as e:
+            self._handle_gemini_error(e)
+            return await self.agenerate_with_groq(prompt, system_prompt)
+    
+    async def _agenerate_gemini_raw(self, prompt: str, system_prompt: str = None) -> str:
+        """Génère avec Google Gemini uniquement : les erreurs sont propagées, sans repli vers Groq"""
+        model, generation_config, full_prompt = self._gemini_request(prompt, system_prompt)
+        
+        print("🔄 Génération asynchrone avec Google Gemini...")
+        
+        response = await self._acall_gemini_with_backoff(
+            lambda: model.generate_content_async(full_prompt, generation_config=generation_config)
+        )
+        
+        if response.text:
+            self.update_token_usage(self._gemini_tokens(response, prompt, system_prompt))
+            
+            print(f"✅ Réponse Gemini générée ({len(response.text)} chars)")
+            return response.text
+        else:
+            return "Erreur: Réponse vide de Gemini"
+    
+    def _handle_gemini_error(self, error: Exception):
+        """Met à jour l'état de Gemini après une erreur (pause sur quota, désactivation sur clé invalide)"""
+        error_str = str(error).lower()
+        print(f"❌ Erreur Gemini: {error}")
+        
+        if _is_rate_limit_error(error):
+            print(f"🔄 Quota Gemini épuisé, basculement vers Groq/Llama 3 pendant {self.gemini_cooldown:.0f}s")
+            self._start_gemini_cooldown()
+        elif any(keyword in error_str for keyword in _AUTH_ERROR_KEYWORDS):
+            print("🔄 Clé Gemini invalide, basculement vers Groq/Llama 3")
+            self.gemini_available = False
+        else:
+            print("🔄 Erreur Gemini, tentative avec Groq/Llama 3")
+    
+    def _get_gemini_model(self):
+        """Modèle Gemini et configuration de génération partagés, créés au premier appel"""
+        if self._gemini_client is None:
+            import google.generativeai as genai
+            
+            genai.configure(api_key=self.google_api_key)
+            self._gemini_generation_config = genai.types.GenerationConfig(
+                temperature=self.temperature,
+                max_output_tokens=self.max_output_tokens,
+                top_p=0.9,
+            )
+            self._gemini_client = genai.GenerativeModel(self.gemini_model)
+        return self._gemini_client, self._gemini_generation_config
+    
+    def _gemini_request(self, prompt: str, system_prompt: Optional[str]):
+        """Modèle, configuration et contenu à envoyer à Gemini
+        
+        Avec le cache de contexte, le prompt système n'est plus renvoyé à chaque requête :
+        seul le prompt utilisateur part vers un modèle lié au contenu mis en cache
+        """
+        model, generation_config = self._get_gemini_model()
+        if self.gemini_context_cache and system_prompt:
+            cached_model = self._get_cached_gemini_model(system_prompt)
+            if cached_model is not None:
+                return cached_model, generation_config, prompt
+        return model, generation_config, _build_prompt(prompt, system_prompt)
+    
+    def _get_cached_gemini_model(self, system_prompt: str):
+        """Modèle Gemini adossé au prompt système mis en cache côté serveur, créé une fois par prompt"""
+        entry = self._gemini_cached_models.get(system_prompt)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+        
+        cached_model = None
+        try:
+            import google.generativeai as genai
+            
+            cached_content = genai.caching.CachedContent.create(
+                model=self.gemini_model,
+                system_instruction=system_prompt,
+                ttl=self.gemini_context_cache_ttl,
+            )
+            cached_model = genai.GenerativeModel.from_cached_content(cached_content=cached_content)
+            print(f"🗄️ Prompt système Gemini mis en cache ({_system_prompt_tokens(system_prompt)} tokens)")
+        except Exception as e:
+            # Prompt trop court pour le cache ou modèle non compatible : prompt complet à chaque appel
+            print(f"⚠️ Cache de contexte Gemini indisponible: {e}")
+        
+        # Recréé peu avant l'expiration du contenu côté serveur (un refus est retenu aussi longtemps)
+        expires_at = time.monotonic() + self.gemini_context_cache_ttl.total_seconds() - 60
+        self._gemini_cached_models[system_prompt] = (cached_model, expires_at)
+        return cached_model
+    
+    def _groq_http_limits(self):
+        """Limites du pool de connexions HTTP partagé par les clients Groq"""
+        import httpx
+        return httpx.Limits(max_connections=self.groq_max_connections,
+                            max_keepalive_connections=self.groq_max_keepalive)
+    
+    def _get_groq_client(self):
+        """Client Groq partagé (pool de connexions keep-alive), créé et validé à la première utilisation"""
+        if self._groq_client is None:
+            try:
+                import httpx
+                from groq import Groq
+                self._groq_client = Groq(
+                    api_key=self.groq_api_key,
+                    http_client=httpx.Client(limits=self._groq_http_limits(), timeout=60.0)
+                )
+            except Exception:
+                self.groq_available = False
+                raise
+        return self._groq_client
+    
+    def _get_async_groq_client(self):
+        """Client AsyncGroq partagé (pool de connexions keep-alive), créé et validé à la première utilisation"""
+        if self._async_groq_client is None:
+            try:
+                import httpx
+                from groq import AsyncGroq
+                self._async_groq_client = AsyncGroq(
+                    api_key=self.groq_api_key,
+                    http_client=httpx.AsyncClient(limits=self._groq_http_limits(), timeout=60.0)
+                )
+            except Exception:
+                self.groq_available = False
+                raise
+        return self._async_groq_client
+    
+    async def agenerate_with_groq(self, prompt: str, system_prompt: str = None) -> str:
+        """Génère avec Groq/Llama 3 sans bloquer la boucle asyncio"""
+        try:
+            client = self._get_async_groq_client()
+            
+            messages = _build_messages(prompt, system_prompt)
+            
+            print("🦙 Génération asynchrone avec Groq/Llama 3...")
+            
+            async with self._provider_slots("groq"):
+                completion = await client.chat.completions.create(
+                    model=self.groq_model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_output_tokens,
+                    top_p=0.9,
+                    stream=False
+                )
+            
+            response_text = completion.choices[0].message.content
+            tokens = self._record_groq_usage(completion)
+            print(f"✅ Réponse Groq/Llama 3 générée ({len(response_text)} chars, {tokens} tokens)")
+            return response_text
+                
+        except Exception as e:
+            print(f"❌ Erreur Groq: {e}")
+            
+            error_str = str(e).lower()
+            if "rate limit" in error_str:
+                return "Limite de taux Groq atteinte. Veuillez réessayer dans quelques instants."
+            elif "api key" in error_str or "unauthorized" in error_str:
+                return "Erreur d'authentification Groq. Vérifiez votre clé API."
+            else:
+                return f"Désolé, j'ai rencontré un problème technique. Erreur: {str(e)}"
+    
+    async def agenerate(self, prompt: str, system_prompt: str = None, speculative: Optional[bool] = None) -> str:
+        """Version asynchrone de generate : plusieurs requêtes partagent la même boucle
+        
+        speculative : lance Gemini et Groq en parallèle et garde la première réponse
+        valide (défaut : variable d'environnement LLM_SPECULATIVE)
+        """
+        if self.semantic_cache is not None:
+            # L'embedding du prompt est calculé hors de la boucle asyncio
+            loop = asyncio.get_running_loop()
+            cached, cache_context = await loop.run_in_executor(self._executor, self._lookup_cache, prompt, system_prompt)
+        else:
+            cached, cache_context = self._lookup_cache(prompt, system_prompt)
+        if cached is not None:
+            return cached
+        
+        if speculative is None:
+            speculative = self.speculative
+        response = await self._agenerate_uncached(prompt, system_prompt, speculative)
+        self._cache_response(cache_context, response)
+        return response
+    
+    async def _agenerate_speculative(self, prompt: str, system_prompt: str = None) -> str:
+        """Interroge Gemini et Groq simultanément : la première réponse valide gagne, l'autre est annulée
+        
+        Gemini est lancé sans repli : un échec ne déclenche pas une seconde requête Groq
+        """
+        tasks = {
+            asyncio.create_task(self._agenerate_gemini_raw(prompt, system_prompt)): "gemini",
+            asyncio.create_task(self.agenerate_with_groq(prompt, system_prompt)): "groq",
+        }
+        pending = set(tasks)
+        fallback_response = None
+        
+        print("🏁 Génération spéculative Gemini + Groq/Llama 3...")
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        if tasks[task] == "gemini":
+                            self._handle_gemini_error(task.exception())
+                        else:
+                            print(f"⚠️ Échec {tasks[task]}: {task.exception()}")
+                        continue
+                    response = task.result()
+                    if response and not response.startswith(_ERROR_PREFIXES):
+                        self.current_provider = tasks[task]
+                        return response
+                    # Message d'erreur : attendre l'autre provider avant de l'utiliser
+                    fallback_response = fallback_response or response
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        return fallback_response or "❌ Aucun LLM disponible. Vérifiez votre configuration Gemini ou votre clé API Groq."
+    
+    async def _agenerate_uncached(self, prompt: str, system_prompt: str = None, speculative: bool = False) -> str:
+        """Choisit le provider et génère de façon asynchrone"""
+        if self.should_use_gemini(self._projected_tokens(prompt, system_prompt)):
+            if speculative and self.groq_available:
+                return await self._agenerate_speculative(prompt, system_prompt)
+            try:
+                self.current_provider = "gemini"
+                return await self.agenerate_with_gemini(prompt, system_prompt)
+            except Exception as e:
+                print(f"⚠️ Échec Gemini: {e}")
+        
+        if self.groq_available:
+            self.current_provider = "groq"
+            return await self.agenerate_with_groq(prompt, system_prompt)
+        else:
+            return "❌ Aucun LLM disponible. Vérifiez votre configuration Gemini ou votre clé API Groq."
+    
+    async def aclose(self):
+        """Ferme le client asynchrone partagé (à appeler à l'arrêt)"""
+        if self._async_groq_client is not None:
+            await self._async_groq_client.close()
+            self._async_groq_client = None
+    
     def reset_gemini_availability(self):
         """Réactive Gemini (utile après une pause)"""
         if self.google_api_key:
+            self._gemini_cooldown_until = None
             self.gemini_available = True
             print("🔄 Gemini réactivé")
     
@@ -246,16 +1035,42 @@ class HybridLLMManagerGemini:
             "gemini_available": self.gemini_available,
             "groq_available": self.groq_available,
             "current_provider": self.current_provider,
+            "max_concurrency": {
+                "gemini": self.gemini_max_concurrency,
+                "groq": self.groq_max_concurrency
+            },
             "token_usage": self.token_usage,
+            "groq_tokens_used": self.groq_tokens_used,
             "limits": {
                 "hourly": self.token_limit_per_hour,
                 "daily": self.token_limit_per_day
             },
+            "response_cache": {
+                "enabled": self.cache_responses,
+                "entries": len(self.response_cache._entries),
+                "semantic_entries": len(self.semantic_cache) if self.semantic_cache is not None else 0
+            },
             "usage_percentage": {
                 "hourly": round((self.token_usage["hourly"]["tokens"] / self.token_limit_per_hour) * 100, 1),
                 "daily": round((self.token_usage["daily"]["tokens"] / self.token_limit_per_day) * 100, 1)
             }
         }
 
-# Instance globale
-hybrid_llm_gemini = HybridLLMManagerGemini()
\ No newline at end of file
+# Instance globale, créée au premier accès (l'import du module reste sans effet de bord)
+_instance: Optional[HybridLLMManagerGemini] = None
+_instance_lock = threading.Lock()
+
+def get_hybrid_llm_gemini() -> HybridLLMManagerGemini:
+    """Renvoie l'instance partagée du gestionnaire, créée une seule fois par processus"""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = HybridLLMManagerGemini()
+    return _instance
+
+def __getattr__(name: str):
+    # Compatibilité : `from utils.hybrid_llm_manager_gemini import hybrid_llm_gemini`
+    if name == "hybrid_llm_gemini":
+        return get_hybrid_llm_gemini()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,47 @@
+"""
+Sérialisation JSON partagée : orjson si disponible, sinon json standard.
+
+Les deux implémentations produisent des octets UTF-8 de même forme
+(compacts, ou indentés de 2 espaces pour les fichiers destinés à être lus).
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Sérialise un objet en JSON.
+
+    Args:
+        obj: Objet à sérialiser (les clés non textuelles sont converties en chaînes)
+        indent: Indenter de 2 espaces (exports lisibles)
+
+    Returns:
+        bytes: JSON encodé en UTF-8
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(data: bytes) -> Any:
+    """
+    Désérialise du JSON.
+
+    Args:
+        data: JSON en octets ou en texte
+
+    Returns:
+        Objet décodé (une entrée invalide lève ValueError)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
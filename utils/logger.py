@@ -4,7 +4,10 @@ Configuration de structlog pour un logging structuré.
 """
 import os
 import sys
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 import structlog
 
@@ -15,17 +18,32 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 # Créer le répertoire de logs s'il n'existe pas
 Path(LOG_DIR).mkdir(exist_ok=True, parents=True)
 
-# Configuration de base du logging
+# Handlers réels (console + fichier), alimentés par un thread d'arrière-plan :
+# les threads applicatifs se contentent de déposer les records dans une file
+_log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler(os.path.join(LOG_DIR, "nextgen_agent.log"))
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Configuration de base du logging ("%(message)s" : le formatage complet est fait par les handlers réels)
 logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format="%(message)s",
     level=getattr(logging, LOG_LEVEL),
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(os.path.join(LOG_DIR, "nextgen_agent.log"))
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
 
 # Configuration de structlog
+# filter_by_level en tête : les records sous le niveau configuré sont écartés avant
+# toute la chaîne ; les rendus de pile/exception ne travaillent que si stack_info/exc_info
+# sont présents, et sont placés après l'horodatage
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
@@ -34,7 +52,7 @@ structlog.configure(
         structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
+        structlog.processors.ExceptionRenderer(),
         structlog.processors.UnicodeDecoder(),
         structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
     ],
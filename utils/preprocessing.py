@@ -0,0 +1,186 @@
+"""
+Fonctions de prétraitement de texte pour NetGuardian.
+
+Les expressions régulières sont compilées une seule fois à l'import :
+chaque appel utilise directement le motif compilé.
+"""
+import re
+from typing import Dict, List
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+_WS_RE = re.compile(r'\s+')
+_CONTROL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_URL_RE = re.compile(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+')
+# La contrainte 0-255 est portée par le motif : findall ne renvoie que des adresses valides
+_IPV4_RE = re.compile(
+    r'\b(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\b'
+)
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Extracteurs de extract_all, dans l'ordre des identifiants Hyperscan
+_EXTRACTORS = {
+    "urls": _URL_RE,
+    "ip_addresses": _IPV4_RE,
+    "email_addresses": _EMAIL_RE,
+}
+
+
+def _build_prefilter():
+    """
+    Base Hyperscan signalant en une passe quels motifs apparaissent dans un texte.
+
+    Returns:
+        Base compilée, ou None si Hyperscan n'est pas disponible
+    """
+    if hyperscan is None:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.pattern.encode() for pattern in _EXTRACTORS.values()],
+            ids=list(range(len(_EXTRACTORS))),
+            elements=len(_EXTRACTORS),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] * len(_EXTRACTORS),
+        )
+        return database
+    except Exception:
+        return None
+
+
+_PREFILTER = _build_prefilter()
+
+
+class _NormalizeTable(dict):
+    """
+    Table str.translate de normalize_query, complétée à la demande.
+
+    Caractères de contrôle supprimés (comme clean_text), ponctuation et symboles
+    (tout ce qui n'est ni \\w ni \\s, Unicode compris) remplacés par une espace,
+    le reste conservé. Chaque caractère n'est classé qu'une fois.
+    """
+
+    def __missing__(self, code: int):
+        char = chr(code)
+        if _CONTROL_RE.match(char):
+            value = None
+        elif char.isalnum() or char == '_' or char.isspace():
+            value = code
+        else:
+            value = ' '
+        self[code] = value
+        return value
+
+
+_NORMALIZE_TABLE = _NormalizeTable()
+
+
+def clean_text(text: str) -> str:
+    """
+    Nettoie un texte (caractères de contrôle, espaces multiples).
+
+    Args:
+        text: Texte à nettoyer
+
+    Returns:
+        Texte nettoyé
+    """
+    if not text:
+        return ""
+    # Texte déjà propre : isprintable() exclut les caractères de contrôle et tout espace
+    # autre que ' ', il ne reste qu'à vérifier les espaces doublés ou en bordure
+    if text.isprintable() and '  ' not in text and text[0] != ' ' and text[-1] != ' ':
+        return text
+    text = _CONTROL_RE.sub('', text)
+    return _WS_RE.sub(' ', text).strip()
+
+
+def extract_urls(text: str) -> List[str]:
+    """
+    Extrait les URLs HTTP(S) d'un texte.
+
+    Args:
+        text: Texte à analyser
+
+    Returns:
+        Liste des URLs trouvées
+    """
+    return _URL_RE.findall(text)
+
+
+def extract_ip_addresses(text: str) -> List[str]:
+    """
+    Extrait les adresses IPv4 valides d'un texte.
+
+    Args:
+        text: Texte à analyser
+
+    Returns:
+        Liste des adresses IPv4 trouvées
+    """
+    return _IPV4_RE.findall(text)
+
+
+def extract_email_addresses(text: str) -> List[str]:
+    """
+    Extrait les adresses e-mail d'un texte.
+
+    Args:
+        text: Texte à analyser
+
+    Returns:
+        Liste des adresses e-mail trouvées
+    """
+    return _EMAIL_RE.findall(text)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalise une requête utilisateur (minuscules, sans ponctuation).
+
+    Args:
+        query: Requête à normaliser
+
+    Returns:
+        Requête normalisée
+    """
+    # Une passe translate puis split/join (espaces fusionnés et bordures retirées)
+    return ' '.join(query.lower().translate(_NORMALIZE_TABLE).split())
+
+
+def extract_all(text: str) -> Dict[str, List[str]]:
+    """
+    Extrait URLs, adresses IPv4 et adresses e-mail d'un même texte.
+
+    Avec Hyperscan, un seul balayage SIMD du texte indique quels motifs sont
+    présents ; seuls ceux-là sont ensuite extraits avec re (résultats identiques
+    aux fonctions extract_*). Sans Hyperscan, chaque motif est appliqué.
+
+    Args:
+        text: Texte à analyser (journaux, tickets...)
+
+    Returns:
+        Dict: Correspondances par type ('urls', 'ip_addresses', 'email_addresses')
+    """
+    names = list(_EXTRACTORS)
+    present = set(range(len(names)))
+
+    if _PREFILTER is not None and text:
+        found = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            found.add(pattern_id)
+
+        try:
+            _PREFILTER.scan(text.encode('utf-8'), match_event_handler=on_match)
+            present = found
+        except Exception:
+            pass
+
+    return {
+        name: _EXTRACTORS[name].findall(text) if index in present else []
+        for index, name in enumerate(names)
+    }